@@ -1,198 +1,275 @@
 import pandas as pd
 import os
+from analytics import combination_table, lineup_four_factors, possession_ratings
+from app_data import write_snapshot
+from catalog import load_catalog, season_games
+from instrument import Instrumentation, profile_call, run_id, write_report
+from manifest import code_version, load_manifest
+from roster import RosterRegistry, lineup_label, lineup_table
+from season import (COMBINATION_TABLES, STATE_SOURCES, fold, game_contribution, load_contribution, load_state,
+                    remove_contribution, save_contribution, save_state)
 
 # Paths
 output_folder = "Output/Games"
 season_folder = "Output/Season"
 
-# Make sure season folder exists
-os.makedirs(season_folder, exist_ok=True)
-
-# Choose two games to merge
-games_to_merge = [ "ALBERTUS_WBB", "AMHERST_WBB", "ANNA_MARIA_WBB", "COLBY_SAWYER_WBB", "Dean", "Emerson", "Emmanuel",
-  "EMMANUEL_WBB", "Fitchburg State", "Gordon", "JWU_PROVIDENCE_WBB", "JWU_PROVIDENCE_WBB2",
-  "LASELL_WBB", "LASELL_WBB2", "MITCHELL_WBB", "NAZARETH", "NEC_WBB", "REGIS_WBB",
-  "RIVIER", "Salem State", "ST_JOSEPH_S(ME)_WBB", "USJ CT", "VSU Lyndon", "WBB NORWICH AT ELMS 2024-25",
-  "Wellesley", "Wentworth", "Westfield", "WPI" ]
-
-
-# ---- 1. Player Plus-Minus ----
-plus_minus_files = [os.path.join(output_folder, f"{game}_plus_minus.csv") for game in games_to_merge]
-plus_minus_dfs = [pd.read_csv(file) for file in plus_minus_files]
-season_plus_minus_df = pd.concat(plus_minus_dfs, ignore_index=True)
-season_plus_minus_df.to_csv(os.path.join(season_folder, "season_plus_minus.csv"), index=False)
-print("✅ Merged player plus-minus for selected games.")
-
-# Season total plus-minus
-season_total_df = season_plus_minus_df.groupby("Player", as_index=False)["Plus/Minus"].sum()
-season_total_df = season_total_df.sort_values("Plus/Minus", ascending=False)
-season_total_df.to_csv(os.path.join(season_folder, "season_plus_minus_totals.csv"), index=False)
-print("✅ Created season total player plus-minus file.")
-
-# ---- 2. Boxscore ----
-boxscore_files = [os.path.join(output_folder, f"{game}_boxscore.csv") for game in games_to_merge]
-boxscore_dfs = [pd.read_csv(file) for file in boxscore_files]
-season_boxscore_df = pd.concat(boxscore_dfs, ignore_index=True)
-season_boxscore_df.to_csv(os.path.join(season_folder, "season_boxscore.csv"), index=False)
-print("✅ Merged boxscores for selected games.")
-
-# ---- 3. Four Factors Summary ----
-four_factors_files = [os.path.join(output_folder, f"{game}_four_factors_summary.csv") for game in games_to_merge]
-four_factors_dfs = [pd.read_csv(file) for file in four_factors_files]
-season_four_factors_df = pd.concat(four_factors_dfs, ignore_index=True)
-season_four_factors_df.to_csv(os.path.join(season_folder, "season_four_factors_summary.csv"), index=False)
-print("✅ Merged four factors summaries for selected games.")
-
-# ---- 4. Lineup Plus-Minus ----
-lineup_pm_files = [os.path.join(output_folder, f"{game}_lineup_pm.csv") for game in games_to_merge]
-lineup_pm_dfs = [pd.read_csv(file) for file in lineup_pm_files]
-season_lineup_pm_df = pd.concat(lineup_pm_dfs, ignore_index=True)
-season_lineup_pm_df.to_csv(os.path.join(season_folder, "season_lineup_pm.csv"), index=False)
-print("✅ Merged lineup plus-minus for selected games.")
-
-def sum_total_time(series):
-    total_seconds = 0
-    for time_str in series:
-        try:
-            parts = time_str.strip().split(":")
-            if len(parts) >= 2:
-                # Only use the last two parts as MM:SS
-                minutes, seconds = map(int, parts[-2:])
-                total_seconds += minutes * 60 + seconds
-        except:
-            continue
-    minutes = total_seconds // 60
-    seconds = total_seconds % 60
-    return f"{minutes:02d}:{seconds:02d}"
-
-# Season total lineup plus-minus with total time and game appearances
-season_lineup_totals_df = season_lineup_pm_df.groupby("Lineup").agg({
-    "Plus/Minus": "sum",
-    "Total Time": sum_total_time,
-    "Game": lambda games: ", ".join(sorted(set(games)))
-}).reset_index()
-
-season_lineup_totals_df = season_lineup_totals_df.sort_values("Plus/Minus", ascending=False)
-season_lineup_totals_df.to_csv(os.path.join(season_folder, "season_lineup_pm_totals.csv"), index=False)
-print("✅ Created season total lineup plus-minus file with total time and game appearances.")
-
-# ---- 5. Merged Lineups ----
-merged_lineups_files = [os.path.join(output_folder, f"{game}_merged_lineups.csv") for game in games_to_merge]
-merged_lineups_dfs = [pd.read_csv(file) for file in merged_lineups_files]
-season_merged_lineups_df = pd.concat(merged_lineups_dfs, ignore_index=True)
-season_merged_lineups_df.to_csv(os.path.join(season_folder, "season_merged_lineups.csv"), index=False)
-print("✅ Merged merged lineups for selected games.")
-
-# ---- 6. Two-Player Combinations ----
-two_player_files = [os.path.join(output_folder, f"{game}_two_player_combinations.csv") for game in games_to_merge]
-two_player_dfs = [pd.read_csv(file) for file in two_player_files]
-season_two_player_df = pd.concat(two_player_dfs, ignore_index=True)
-season_two_player_df.to_csv(os.path.join(season_folder, "season_two_player_combinations.csv"), index=False)
-print("✅ Merged two-player combinations for selected games.")
-
-# Season total two-player plus-minus
-season_two_player_totals_df = season_two_player_df.groupby(["Player 1", "Player 2"], as_index=False)["Plus/Minus"].sum()
-season_two_player_totals_df = season_two_player_totals_df.sort_values("Plus/Minus", ascending=False)
-season_two_player_totals_df.to_csv(os.path.join(season_folder, "season_two_player_totals.csv"), index=False)
-print("✅ Created season total two-player combinations file.")
-
-# ---- SEASON TOTAL MERGED LINEUPS ----
-def sum_time_column(series):
-    total_seconds = 0
-    for t in series:
-        try:
-            parts = t.strip().split(":")
-            if len(parts) == 2:
-                minutes, seconds = map(int, parts)
-            elif len(parts) == 3:
-                hours, minutes, seconds = map(int, parts)
-                minutes += hours * 60
-            else:
-                continue
-            total_seconds += minutes * 60 + seconds
-        except:
-            continue
-
-    minutes = total_seconds // 60
-    seconds = total_seconds % 60
-    return f"{minutes:02d}:{seconds:02d}"
-
-season_merged_lineups_totals_df = season_merged_lineups_df.groupby("Lineup", as_index=False).agg({
-    "Plus/Minus Per 25 Minutes": "sum",
-    "Plus/Minus Per Minute": "sum",
-    "Total Time": sum_time_column
-})
-
-season_merged_lineups_totals_df = season_merged_lineups_totals_df.sort_values("Plus/Minus Per 25 Minutes", ascending=False)
-season_merged_lineups_totals_df.to_csv(os.path.join(season_folder, "season_merged_lineups_totals.csv"), index=False)
-print("✅ Created season total merged lineups file.")
-
-# ---- SEASON AVERAGE BOXSCORE ----
-season_boxscore_df_numeric = season_boxscore_df.copy()
-
-for col in ["FGM", "FGA", "3PM", "3PA", "FTM", "FTA", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TO", "PF", "PTS", "MIN"]:
-    season_boxscore_df_numeric[col] = pd.to_numeric(season_boxscore_df_numeric[col], errors="coerce").fillna(0)
-
-season_boxscore_totals = season_boxscore_df_numeric.groupby(["Player", "Team"], as_index=False).sum()
-
-season_boxscore_totals["FG%"] = (season_boxscore_totals["FGM"] / season_boxscore_totals["FGA"] * 100).round(2)
-season_boxscore_totals["3P%"] = (season_boxscore_totals["3PM"] / season_boxscore_totals["3PA"] * 100).round(2)
-season_boxscore_totals["FT%"] = (season_boxscore_totals["FTM"] / season_boxscore_totals["FTA"] * 100).round(2)
-
-ordered_cols = [
-    "Team", "Player", "MIN", "FGM", "FGA", "FG%", "3PM", "3PA", "3P%", "FTM", "FTA", "FT%", 
-    "OREB", "DREB", "REB", "AST", "STL", "BLK", "TO", "PF", "PTS"
-]
-season_boxscore_totals = season_boxscore_totals[ordered_cols]
-
-season_boxscore_totals.to_csv(os.path.join(season_folder, "season_boxscore_totals.csv"), index=False)
-print("✅ Created season total boxscore file.")
-
-# ---- SEASON AVERAGE FOUR FACTORS ----
-# Clean up player names to prevent duplicates caused by extra spaces or casing
-season_four_factors_df["Player"] = season_four_factors_df["Player"].str.strip().str.upper()
-
-# Group by cleaned names and average
-from thefuzz import process
-
-# ---- SEASON AVERAGE FOUR FACTORS (CLEANED) ----
-
-# Step 0: Official Elms player list
-player_names = ["SMITH,HEAVEN", "GUERRIER,PHONIA", "PACHECO,MIA", "TURCO,MARY", "WASIEWICZ,GABBY",
-                            "LEWIS,JADE","URIBE,TALIA","GORSKI,JENNY","BARRON,SHEA","LEBEL,KELLY","ASFAW,SOLIYANA",
-                            "JOHNSTON,RAHMIA","GRAHAM,PIPER","ANDRADE,SOPHIA","MILDNER,STEPHANIE"]
-
-# Step 1: Normalize player names in the DataFrame
-season_four_factors_df["Player"] = season_four_factors_df["Player"].str.strip().str.upper()
-
-# Step 2: Fuzzy match each player to the official list
-def match_to_roster(name, roster):
-    match, score = process.extractOne(name, roster)
-    return match if score >= 80 else None
-
-season_four_factors_df["Matched Player"] = season_four_factors_df["Player"].apply(
-    lambda name: match_to_roster(name, player_names)
-)
-
-# Step 3: Drop unmatched (non-Elms) players
-season_four_factors_df = season_four_factors_df.dropna(subset=["Matched Player"])
-
-# Step 4: Group by matched player name and average stats
-season_four_factors_averages_df = (
-    season_four_factors_df
-    .groupby("Matched Player", as_index=False)[["OREB%", "TOV%", "EFG%", "FTR"]]
-    .mean()
-    .round(2)
-)
-
-# Step 5: Rename column to "Player"
-season_four_factors_averages_df.rename(columns={"Matched Player": "Player"}, inplace=True)
-
-# Step 6: Save the output
-season_four_factors_averages_df.to_csv(os.path.join(season_folder, "season_four_factors_averages.csv"), index=False)
-print("✅ Created cleaned season average four factors summary using official player list.")
-from shiny import App, ui, render
-import pandas as pd
-import os
-
-
+# Least minutes a pair, trio or quartet must have played together to be listed in its season table
+COMBINATION_MIN_MINUTES = {2: 0, 3: 10, 4: 10}
+
+# Season output name of each combination table
+COMBINATION_OUTPUTS = {2: "season_two_player_totals", 3: "season_three_player_totals", 4: "season_four_player_totals"}
+
+# Per-game artifacts listed game by game in the season folder (season_<artifact>.csv)
+LISTED_ARTIFACTS = ["plus_minus", "boxscore", "four_factors_summary", "lineup_pm", "merged_lineups",
+                    "two_player_combinations", "lineup_four_factors", "game_ratings"]
+
+
+def per_minutes(plus_minus, seconds, minutes):
+    """Plus-minus per `minutes` minutes on the floor, derived from season totals."""
+    return (plus_minus * 60 * minutes / seconds.where(seconds > 0)).round(2)
+
+
+def update_listing(artifact, games, refreshed):
+    """
+    Keeps season_<artifact>.csv in step with the season: rows of removed or refreshed games are dropped
+    and only the refreshed games' files are read and appended.
+    """
+    listing_path = os.path.join(season_folder, f"season_{artifact}.csv")
+    if os.path.exists(listing_path):
+        previous = pd.read_csv(listing_path, dtype={"Game": str})
+        listing = previous[previous["Game"].isin(set(games) - set(refreshed))]
+        appended = refreshed
+        if not appended and len(listing) == len(previous):
+            return
+    else:
+        listing = pd.DataFrame()
+        appended = games
+
+    game_dfs = [pd.read_csv(os.path.join(output_folder, f"{game}_{artifact}.csv"), dtype={"Game": str})
+                for game in appended]
+    frames = [frame for frame in [listing, *game_dfs] if not frame.empty]
+    listing = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if game_dfs:
+        # Columns follow the newest files, in case the artifact's schema changed
+        newest_columns = list(game_dfs[-1].columns)
+        listing = listing.reindex(columns=newest_columns + [column for column in listing.columns
+                                                            if column not in newest_columns])
+    if "Game" in listing.columns:
+        listing = listing.sort_values("Game", kind="stable")
+    listing.to_csv(listing_path, index=False)
+
+
+def write_app_snapshot():
+    """Prebuilds the app's boot snapshot from every season CSV and the game catalog."""
+    csv_paths = [os.path.join(season_folder, f) for f in sorted(os.listdir(season_folder)) if f.endswith(".csv")]
+    write_snapshot(csv_paths)
+
+
+def with_ratings(totals_df, on_court):
+    """Appends the possession counts and per-100-possession ratings of a season state table to its output rows."""
+    totals_df["Offensive Possessions"] = on_court["possessions_for"].to_numpy()
+    totals_df["Defensive Possessions"] = on_court["possessions_against"].to_numpy()
+    return pd.concat([totals_df, possession_ratings(on_court).reset_index(drop=True)], axis=1)
+
+
+def player_totals(players, names):
+    player_ids = players.index.to_numpy()
+    plus_minus = players["points_for"] - players["points_against"]
+    totals_df = pd.DataFrame({
+        "Player": [names[player_id] for player_id in player_ids],
+        "Plus/Minus": plus_minus.to_numpy(),
+        "Points For": players["points_for"].to_numpy(),
+        "Points Against": players["points_against"].to_numpy(),
+        "Total Seconds": players["seconds"].to_numpy(),
+        "Games": players["games"].to_numpy(),
+        "Plus/Minus Per 25 Minutes": per_minutes(plus_minus, players["seconds"], 25).to_numpy(),
+    })
+    totals_df = with_ratings(totals_df, players)
+    return totals_df.sort_values(["Plus/Minus", "Player"], ascending=[False, True])
+
+
+def lineup_totals(lineups, names):
+    plus_minus = lineups["points_for"] - lineups["points_against"]
+    totals_df = pd.DataFrame({
+        "Lineup ID": lineups.index.to_numpy(),
+        "Lineup": [lineup_label(lineup, names) for lineup in lineups.index],
+        "Plus/Minus": plus_minus.to_numpy(),
+        "Total Seconds": lineups["seconds"].to_numpy(),
+        "Games": lineups["games"].to_numpy(),
+        "Points For": lineups["points_for"].to_numpy(),
+        "Points Against": lineups["points_against"].to_numpy(),
+        "Plus/Minus Per 25 Minutes": per_minutes(plus_minus, lineups["seconds"], 25).to_numpy(),
+        "Plus/Minus Per Minute": per_minutes(plus_minus, lineups["seconds"], 1).to_numpy(),
+    })
+    totals_df = with_ratings(totals_df, lineups)
+    return totals_df.sort_values(["Plus/Minus", "Lineup"], ascending=[False, True])
+
+
+def lineup_outcomes(lineups, names):
+    """Game outcome index: how many games each lineup finished ahead, behind or even, and its time."""
+    outcomes_df = pd.DataFrame({
+        "Lineup ID": lineups.index.to_numpy(),
+        "Lineup": [lineup_label(lineup, names) for lineup in lineups.index],
+        "Positive Games": lineups["positive_games"].to_numpy(),
+        "Negative Games": lineups["negative_games"].to_numpy(),
+        "Zero Games": lineups["zero_games"].to_numpy(),
+        "Appearances": lineups["games"].to_numpy(),
+        "Total Seconds": lineups["seconds"].to_numpy(),
+    })
+    return outcomes_df.sort_values(["Positive Games", "Lineup"], ascending=[False, True])
+
+
+def lineup_four_factors_totals(lineups, names):
+    """Season Four Factors of every lineup and of its opponents, from the summed play event counts."""
+    totals_df = pd.DataFrame({
+        "Lineup ID": lineups.index.to_numpy(),
+        "Lineup": [lineup_label(lineup, names) for lineup in lineups.index],
+        "Total Seconds": lineups["seconds"].to_numpy(),
+        "Games": lineups["games"].to_numpy(),
+    })
+    totals_df = pd.concat([totals_df, lineup_four_factors(lineups).reset_index(drop=True)], axis=1)
+    return totals_df.sort_values(["Total Seconds", "Lineup"], ascending=[False, True])
+
+
+def combination_totals_table(combinations, names, size):
+    """
+    Season totals of every `size`-player combination with at least COMBINATION_MIN_MINUTES[size] minutes together,
+    players in name order.
+    """
+    combinations = combinations[combinations["seconds"] >= COMBINATION_MIN_MINUTES[size] * 60]
+    totals_df = combination_table(combinations, names, size)
+    totals_df.insert(totals_df.columns.get_loc("Total Seconds") + 1, "Games", combinations["games"].to_numpy())
+    player_columns = [f"Player {slot}" for slot in range(1, size + 1)]
+    return totals_df.sort_values(["Plus/Minus", *player_columns], ascending=[False] + [True] * size)
+
+
+def boxscore_totals(boxscore):
+    totals_df = boxscore.reset_index()
+    totals_df["FG%"] = (totals_df["FGM"] / totals_df["FGA"] * 100).round(2)
+    totals_df["3P%"] = (totals_df["3PM"] / totals_df["3PA"] * 100).round(2)
+    totals_df["FT%"] = (totals_df["FTM"] / totals_df["FTA"] * 100).round(2)
+
+    ordered_cols = [
+        "Team", "Player", "MIN", "FGM", "FGA", "FG%", "3PM", "3PA", "3P%", "FTM", "FTA", "FT%",
+        "OREB", "DREB", "REB", "AST", "STL", "BLK", "TO", "PF", "PTS"
+    ]
+    return totals_df[ordered_cols]
+
+
+def four_factors_averages(four_factors):
+    averages_df = pd.DataFrame({
+        factor: (four_factors[f"{factor} sum"] / four_factors[f"{factor} count"].where(four_factors[f"{factor} count"] > 0)).round(2)
+        for factor in ["OREB%", "TOV%", "EFG%", "FTR"]
+    })
+    return averages_df.reset_index()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold the per-game CSVs into season totals.")
+    parser.add_argument("--report", help="Append per-stage timings of this merge to this JSONL file")
+    parser.add_argument("--profile", help="Read the slowest game's contribution again under cProfile and dump its stats here")
+    args = parser.parse_args()
+
+    # Make sure season folder exists
+    os.makedirs(season_folder, exist_ok=True)
+    registry = RosterRegistry()
+    instrumentation = Instrumentation(enabled=bool(args.report or args.profile), trace_memory=bool(args.report))
+
+    # Step 1: Games come from the game catalog written by analytics.py (built successfully, duplicates left out)
+    games_to_merge = season_games(load_catalog())
+    manifest = load_manifest()
+    stamps = {game: [manifest["games"][game][key] for key in ("sha256", "code_version", "roster")]
+              for game in games_to_merge}
+
+    # Step 2: Diff against the games already folded into the season state
+    state = load_state(code_version(STATE_SOURCES))
+    output_version = code_version(["Season_Merge.py"])
+    removed = sorted(set(state["games"]) - set(stamps))
+    changed = sorted(game for game in stamps if game in state["games"] and state["games"][game] != stamps[game])
+    added = sorted(set(stamps) - set(state["games"]))
+    if not (removed or changed or added) and state.get("output_version") == output_version:
+        # The game catalog may still have been rewritten, so the app snapshot is refreshed regardless
+        write_app_snapshot()
+        print("✅ Season files are up to date; no game changed since the last merge.")
+        raise SystemExit(0)
+
+    # Step 3: Subtract the old contribution of removed or changed games, then add the new ones
+    # (in memory only: nothing is saved until every season output has been written, see Step 6)
+    for game in removed + changed:
+        instrumentation.context["game"] = game
+        with instrumentation.stage("subtract"):
+            fold(state, load_contribution(game), sign=-1)
+    for game in removed:
+        del state["games"][game]
+    new_contributions = {}
+    for game in changed + added:
+        instrumentation.context["game"] = game
+        with instrumentation.stage("contribution") as stage:
+            new_contributions[game] = game_contribution(game, output_folder, registry)
+            stage["rows_out"] = sum(len(frame) for frame in new_contributions[game].values())
+        with instrumentation.stage("fold", rows_in=stage["rows_out"]):
+            fold(state, new_contributions[game])
+        state["games"][game] = stamps[game]
+    instrumentation.context["game"] = None
+    print(f"✅ Folded season state: {len(added)} added, {len(changed)} changed, {len(removed)} removed "
+          f"({len(stamps)} games).")
+
+    # Step 4: Game-by-game listings only read the files of refreshed games
+    with instrumentation.stage("listings", rows_in=len(changed + added)):
+        for artifact in LISTED_ARTIFACTS:
+            update_listing(artifact, games_to_merge, changed + added)
+    print("✅ Updated game-by-game season listings.")
+
+    # Step 5: Derive every season total and rate from the running totals
+    with instrumentation.stage("season totals") as stage:
+        tables = state["tables"]
+        season_outputs = {
+            "season_plus_minus_totals": player_totals(tables["players"], registry.players),
+            "season_lineup_pm_totals": lineup_totals(tables["lineups"], registry.players)[
+                ["Lineup ID", "Lineup", "Plus/Minus", "Total Seconds", "Games", "Points For", "Points Against",
+                 "Offensive Possessions", "Defensive Possessions", "Offensive Rating", "Defensive Rating",
+                 "Net Rating"]],
+            "season_merged_lineups_totals": lineup_totals(tables["lineups"], registry.players)[
+                ["Lineup ID", "Lineup", "Plus/Minus Per 25 Minutes", "Plus/Minus Per Minute", "Total Seconds"]]
+                .sort_values("Plus/Minus Per 25 Minutes", ascending=False, kind="stable"),
+            "season_lineup_outcomes": lineup_outcomes(tables["lineups"], registry.players),
+            "season_lineup_four_factors_totals": lineup_four_factors_totals(tables["lineups"], registry.players),
+            **{COMBINATION_OUTPUTS[size]: combination_totals_table(tables[table], registry.players, size)
+               for size, table in COMBINATION_TABLES.items()},
+            "season_boxscore_totals": boxscore_totals(tables["boxscore"]),
+            "season_four_factors_averages": four_factors_averages(tables["four_factors"]),
+            # Lineup dimension table: Lineup ID -> player IDs and names
+            "season_lineups": lineup_table(tables["lineups"].index, registry.players),
+        }
+        for name, df in season_outputs.items():
+            df.to_csv(os.path.join(season_folder, f"{name}.csv"), index=False)
+        stage["rows_out"] = sum(len(df) for df in season_outputs.values())
+    print("✅ Created season totals for players, lineups, pairs, trios, quartets, boxscore and four factors "
+          "(player and lineup), and the lineup table.")
+
+    # Step 6: Save the season state only now that every output reflects it, so a failed merge is redone next run
+    for game in removed:
+        remove_contribution(game)
+    for game, contribution in new_contributions.items():
+        save_contribution(game, contribution)
+    state["output_version"] = output_version
+    save_state(state)
+    print("✅ Saved the season state.")
+
+    # Step 7: One prebuilt snapshot of the season data, so the app boots without parsing every CSV
+    with instrumentation.stage("snapshot"):
+        write_app_snapshot()
+    print("✅ Wrote the app startup snapshot.")
+
+    # Step 8 (optional): per-stage report and a profile of the slowest game's contribution
+    if args.report:
+        write_report(args.report, instrumentation.records, run=run_id(), script="Season_Merge",
+                     code_version=output_version)
+        print(f"✅ Appended per-stage timings to {args.report}")
+    contributions = [record for record in instrumentation.records if record["stage"] == "contribution"]
+    if args.profile and contributions:
+        slowest = max(contributions, key=lambda record: record["wall_seconds"])
+        profile_call(args.profile, game_contribution, slowest["game"], output_folder, registry)
+        print(f"✅ Profiled the slowest contribution, {slowest['game']}, to {args.profile}")
@@ -1,53 +1,217 @@
-import pandas as pd
+import contextlib
+import io
+import os
+import tempfile
+import time
 import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, repeat
+
+import numpy as np
+import pandas as pd
+
+from catalog import catalog_entry, write_catalog
+from instrument import Instrumentation, profile_call, run_id, write_report
+from manifest import (code_version, file_sha256, game_fingerprint, is_up_to_date, load_manifest,
+                      mark_duplicates, roster_signature, save_manifest)
+from roster import (LINEUP_SIZE, RosterRegistry, is_elms, lineup_label, lineup_mask, lineup_members,
+                    lineup_player_ids, name_order, popcount)
+from store import STORE_FOLDER, remove_game, season_label, store_available, write_game
+
 pd.set_option('display.max_columns', None)
 pd.set_option('display.max_rows', None)
 pd.set_option('display.width', 200)
 pd.set_option('display.max_colwidth', 50)
 
-def parse_xml_to_df(file_path):
-    tree = ET.parse(file_path)
-    root = tree.getroot()
-
-    plays_data = []
-    for play in root.findall(".//play"):
-        play_info = {
-            "team": play.get("team"),
-            "player": play.get("checkname"),
-            "action": play.get("action"),
-            "type": play.get("type", ""),
-            "time": play.get("time"),
-            "score_v": play.get("vscore", ""),
-            "score_h": play.get("hscore", "")
-        }
-        plays_data.append(play_info)
+Game = namedtuple("Game", ["plays", "boxscore", "venue", "roster", "periods"])
+
+# Boxscore column -> <stats> attribute
+BOXSCORE_STATS = {
+    "MIN": "min", "FGM": "fgm", "FGA": "fga", "FG%": "fgpct", "3PM": "fgm3", "3PA": "fga3",
+    "3P%": "fg3pct", "FTM": "ftm", "FTA": "fta", "FT%": "ftpct", "OREB": "oreb", "DREB": "dreb",
+    "REB": "treb", "AST": "ast", "STL": "stl", "BLK": "blk", "TO": "to", "PF": "pf", "PTS": "tp"
+}
+
+# Boxscore counting stats (typed as integers); the other <stats> columns are shooting percentages
+COUNT_COLUMNS = ["MIN", "FGM", "FGA", "3PM", "3PA", "FTM", "FTA", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TO",
+                 "PF", "PTS"]
+PERCENT_COLUMNS = ["FG%", "3P%", "FT%"]
+
+# Play-by-play column -> <play> attribute
+PLAY_ATTRIBUTES = {
+    "vh": "vh", "team": "team", "player": "checkname", "action": "action", "type": "type",
+    "time": "time", "score_v": "vscore", "score_h": "hscore"
+}
+PLAY_CATEGORIES = ["vh", "team", "player", "action", "type"]
+
+# Used when a file has no <rules> block (four 10-minute quarters, 5-minute overtime)
+DEFAULT_RULES = {"prds": "4", "minutes": "10", "minutesot": "5"}
+
+# Play events counted per stint (see play_events), by Elms ("<event>_for") and by the opponent ("<event>_against")
+STINT_EVENTS = ["fgm", "fga", "fg3m", "fta", "oreb", "dreb", "tov", "fouls"]
+STINT_EVENT_COLUMNS = [f"{event}_{side}" for event in STINT_EVENTS for side in ("for", "against")]
+
+# Stint totals that per-100-possession ratings are derived from (see possession_ratings)
+POSSESSION_TOTALS = ["points_for", "points_against", "possessions_for", "possessions_against"]
+
+# Stint totals summed for every pair, trio and quartet of a lineup (see combination_totals)
+COMBINATION_TOTALS = ["seconds", *POSSESSION_TOTALS]
+COMBINATION_SIZES = [2, 3, 4]
 
+
+def parse_game(file_path):
+    """
+    Parses a PrestoSports <bbgame> file in a single streaming pass.
+    Returns a Game with the play-by-play, player boxscore, venue metadata
+    (including <status> and each team's <linescore>), the roster (checkname/playerId of every boxscore row)
+    and the period table (see period_table).
+    Elements are cleared as soon as they are read so memory stays flat for large files.
+    """
+    plays_data = {column: [] for column in PLAY_ATTRIBUTES}
+    plays_data["period"] = []
+    player_stats_data = []
+    roster_data = []
+    venue = {"teams": {}}
+    team_name = None
+    team_id = None
+    team_vh = None
+    period = 0
+    period_lengths = {}  # <period number> -> seconds, from its time="MM:SS" attribute
+
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        tag = elem.tag
+
+        if event == "start":
+            if tag == "team":
+                team_name = elem.get("name")
+                team_id = elem.get("id")
+                team_vh = elem.get("vh")
+                venue["teams"][team_vh] = {"id": team_id, "name": team_name}
+            elif tag == "period":
+                period = int(elem.get("number"))
+                minutes, _, seconds = elem.get("time", "").partition(":")
+                if minutes.isdigit() and seconds.isdigit():
+                    period_lengths[period] = int(minutes) * 60 + int(seconds)
+            continue
+
+        if tag == "play":
+            for column, attribute in PLAY_ATTRIBUTES.items():
+                plays_data[column].append(elem.get(attribute, ""))
+            plays_data["period"].append(period)
+            elem.clear()
+        elif tag == "player":
+            stats = elem.find("stats")
+            if stats is not None:
+                player_row = {"Team": team_name, "Player": elem.get("name"), "No.": elem.get("uni")}
+                for column, attribute in BOXSCORE_STATS.items():
+                    player_row[column] = stats.get(attribute)
+                player_stats_data.append(player_row)
+                roster_data.append({
+                    "Team": team_name, "team_id": team_id, "Player": elem.get("name"),
+                    "checkname": elem.get("checkname", ""), "playerId": elem.get("playerId", "")
+                })
+            elem.clear()
+        elif tag == "linescore":
+            venue["teams"].setdefault(team_vh, {}).update(score=elem.get("score"), line=elem.get("line"))
+        elif tag == "status":
+            venue["status"] = dict(elem.attrib)
+        elif tag == "rules":
+            venue["rules"] = dict(elem.attrib)
+        elif tag == "venue":
+            venue.update(elem.attrib)
+            elem.clear()
+        elif tag in ("team", "period"):
+            elem.clear()
+
+    last_period = max([period, *period_lengths, int(venue.get("status", {}).get("period") or 0)])
+    periods_df = period_table(period_lengths, venue.get("rules", DEFAULT_RULES), last_period)
+    plays_df = generate_plays_df(plays_data, venue, periods_df)
+    boxscore_df = generate_boxscore(player_stats_data)
+
+    roster_df = pd.DataFrame(roster_data)
+
+    return Game(plays_df, boxscore_df, venue, roster_df, periods_df)
+
+
+def period_table(period_lengths, rules, last_period):
+    """
+    Start, end and length (elapsed game seconds) of periods 1..last_period, indexed by period number.
+    Lengths come from the <period time="10:00"> elements; a period without one falls back to the <rules> block
+    (prds regulation periods of `minutes`, then overtime periods of `minutesot`).
+    """
+    regulation_periods = int(rules.get("prds", DEFAULT_RULES["prds"]))
+    period_seconds = int(rules.get("minutes", DEFAULT_RULES["minutes"])) * 60
+    overtime_seconds = int(rules.get("minutesot", DEFAULT_RULES["minutesot"])) * 60
+
+    numbers = np.arange(1, max(last_period, 1) + 1)
+    lengths = np.array([period_lengths.get(number, period_seconds if number <= regulation_periods else overtime_seconds)
+                        for number in numbers], dtype=np.int32)
+    ends = np.cumsum(lengths, dtype=np.int32)
+    return pd.DataFrame({"start": ends - lengths, "end": ends, "length": lengths},
+                        index=pd.Index(numbers, name="period"))
+
+
+def generate_plays_df(plays_data, venue, periods_df):
+    """
+    Builds the typed play-by-play event table:
+    - vh, team, player, action and type as categoricals
+    - period (int8), clock as seconds remaining in the period and elapsed game seconds (int16)
+    - running scores and the Elms lead (int16)
+    The clock is converted once here; every later stage works in integer seconds.
+    """
     df = pd.DataFrame(plays_data)
 
+    for column in PLAY_CATEGORIES:
+        df[column] = df[column].astype("category")
+
+    # Convert the "MM:SS" clock once; later stages only use integer seconds
+    df['period'] = df['period'].astype('int8')
+    df['clock'] = clock_to_seconds(df.pop('time')).astype('int16')
+    df['elapsed'] = elapsed_seconds(df['period'], df['clock'], periods_df).astype('int16')
+
     # Convert scores to numeric
-    df['score_v'] = pd.to_numeric(df['score_v'], errors='coerce').ffill().fillna(0).astype(int)
-    df['score_h'] = pd.to_numeric(df['score_h'], errors='coerce').ffill().fillna(0).astype(int)
+    df['score_v'] = pd.to_numeric(df['score_v'], errors='coerce').ffill().fillna(0).astype('int16')
+    df['score_h'] = pd.to_numeric(df['score_h'], errors='coerce').ffill().fillna(0).astype('int16')
 
     # Calculate lead
-    venue = root.find(".//venue")
-    homename = venue.get("homename")
-
-    if "elm" in homename.lower():
+    if elms_side(venue) == "H":
         df['lead'] = df['score_h'] - df['score_v']
     else:
         df['lead'] = df['score_v'] - df['score_h']
 
-    return df, root
+    return df
+
+
+def elms_side(venue):
+    """Returns "H" when Elms is the home team in the venue metadata, otherwise "V"."""
+    return "H" if is_elms(venue.get("homename", "")) else "V"
 
 
-from thefuzz import process
+def clock_to_seconds(clock):
+    """Converts a Series of "MM:SS" clock strings to integer seconds."""
+    parts = clock.str.split(":", n=1, expand=True).astype(int)
+    return parts[0] * 60 + parts[1]
 
-def match_player_names(df, player_names):
-    for column in ['player']:
-        for index, row in df.iterrows():
-            closest_match = process.extractOne(str(row[column]), player_names, scorer=process.fuzz.token_sort_ratio)
-            if closest_match and closest_match[1] >= 70:
-                df.loc[index, column] = closest_match[0]
+
+def elapsed_seconds(period, clock, periods_df):
+    """Converts period + seconds remaining into absolute elapsed game seconds, using the period table."""
+    period_end = periods_df["end"].to_numpy()[period.to_numpy(dtype=np.int32) - 1]
+    return pd.Series(period_end - clock.to_numpy(dtype=np.int32), index=clock.index)
+
+
+def match_player_names(df, roster_df, canonical_names):
+    """
+    Replaces Elms checknames in the play-by-play with their canonical registry names.
+    Plays carry the same checkname as the <player> element, so this is one lookup per distinct name.
+    """
+    elms_names = dict(zip(roster_df.loc[canonical_names.notna(), "checkname"], canonical_names.dropna()))
+    elms_team_ids = set(roster_df.loc[canonical_names.notna(), "team_id"])
+    elms_rows = df['team'].isin(elms_team_ids)
+
+    df['player'] = df['player'].astype(object)
+    df.loc[elms_rows, 'player'] = df.loc[elms_rows, 'player'].map(lambda name: elms_names.get(name, name))
+    df['player'] = df['player'].astype('category')
     return df
 
 
@@ -56,7 +220,7 @@ def find_starters(df, player_names):
     starter_count = 0  # Initialize a counter for starters
 
     for player in player_names:
-        player_df = df[df['player'].str.contains(player, case=False, na=False)]
+        player_df = df[df['player'] == player]
         if not player_df.empty:
             first_action = player_df['action'].iloc[0]
             first_type = player_df['type'].iloc[0]
@@ -66,441 +230,432 @@ def find_starters(df, player_names):
                 if starter_count == 5:  # Break if we've found 5 starters
                     break
 
-    print("✅ Starters identified:", starters)
     return starters
 
 
 
-def update_lineup(df, player_names, starters):
-    from thefuzz import process
-    current_lineup = set(starters)
-    df['lineup'] = ''
-
-    for index, row in df.iterrows():
-        df.loc[index, 'lineup'] = str(list(current_lineup))
-        if "sub" in str(row['action']).lower():
-            if "in" in str(row['type']).lower():
-                closest_match = process.extractOne(str(row['player']), player_names, scorer=process.fuzz.token_set_ratio)
-                if closest_match and closest_match[1] >= 80:
-                    current_lineup.add(closest_match[0])
-            elif "out" in str(row['type']).lower():
-                closest_match = process.extractOne(str(row['player']), player_names, scorer=process.fuzz.token_set_ratio)
-                if closest_match and closest_match[1] >= 80:
-                    current_lineup.discard(closest_match[0])
+def update_lineup(df, player_ids, starters):
+    """
+    Tracks the Elms lineup on the floor as an int64 bitmask over registry Player IDs.
+    Each row holds the lineup before that row's substitution is applied.
+    """
+    current_lineup = lineup_mask(player_ids[player] for player in starters)
+    lineups = np.empty(len(df), dtype=np.int64)
+
+    sub_rows = np.flatnonzero((df['action'] == "SUB").to_numpy() & df['player'].isin(list(player_ids)).to_numpy())
+    previous_row = 0
+    for row, player, sub_type in zip(sub_rows, df['player'].to_numpy()[sub_rows], df['type'].to_numpy()[sub_rows]):
+        lineups[previous_row:row + 1] = current_lineup
+        if sub_type == "IN":
+            current_lineup |= 1 << player_ids[player]
+        elif sub_type == "OUT":
+            current_lineup &= ~(1 << player_ids[player])
+        previous_row = row + 1
+    lineups[previous_row:] = current_lineup
+
+    df['lineup'] = lineups
     return df
 
 
-def calculate_plus_minus(df):
-    plus_minus_data = []
-    player_stints = {}
-
-    for index, row in df.iterrows():
-        current_lineup = eval(row['lineup'])
-        previous_lead = df.loc[index - 1, 'lead'] if index > 0 else 0
-        lead_change = row['lead'] - previous_lead
-        for player in current_lineup:
-            player_stints[player] = player_stints.get(player, 0) + lead_change
-
-    for player, plus_minus in player_stints.items():
-        plus_minus_data.append({'Player': player, 'Plus/Minus': plus_minus})
-
-    return pd.DataFrame(plus_minus_data)
-
-
-def generate_lineup_plus_minus(df):
+def play_events(df):
     """
-    Calculates plus-minus and total time for each unique 5-player lineup.
-    Returns a DataFrame with Lineup, Plus/Minus, and Total Time.
+    Flags the plays that count toward the Four Factors, one boolean array per STINT_EVENTS entry:
+    made/attempted field goals (GOOD/MISS other than free throws), made threes, free-throw attempts,
+    offensive/defensive rebounds (dead-ball team rebounds are not counted), turnovers and fouls.
     """
-    from collections import defaultdict
-
-    lineup_data = defaultdict(lambda: {"plus_minus": 0, "total_seconds": 0})
-    current_lineup = None
-    start_time = None
-    start_lead = None
-    previous_seconds = None
-    start_half = '1st Half'
-
-    def time_to_seconds(time_str):
-        minutes, seconds = map(int, time_str.split(':'))
-        return minutes * 60 + seconds
-
-    def calculate_time_diff_seconds(start, end):
-        return abs(time_to_seconds(end) - time_to_seconds(start))
+    action, play_type = df['action'], df['type']
+    shot = action.isin(["GOOD", "MISS"]).to_numpy()
+    made = (action == "GOOD").to_numpy()
+    free_throw = (play_type == "FT").to_numpy()
+    rebound = (action == "REBOUND").to_numpy()
+
+    return {
+        "fgm": made & ~free_throw,
+        "fga": shot & ~free_throw,
+        "fg3m": made & (play_type == "3PTR").to_numpy(),
+        "fta": shot & free_throw,
+        "oreb": rebound & (play_type == "OFF").to_numpy(),
+        "dreb": rebound & (play_type == "DEF").to_numpy(),
+        "tov": (action == "TURNOVER").to_numpy(),
+        "fouls": (action == "FOUL").to_numpy(),
+    }
+
+
+def segment_possessions(df):
+    """
+    Splits the play table into possessions, numbered in order ('possession'), each with the side on offense
+    ('offense': "H"/"V", empty for a stretch with no offensive play, such as subs before the end of a period).
+    A possession ends on:
+    - a made field goal, unless the same team shoots free throws at the same time (and-one)
+    - the last free throw of a trip, when it is made
+    - a defensive rebound (including a dead-ball rebound credited to the defense)
+    - a turnover
+    - the end of a period
+    """
+    action, play_type = df['action'], df['type']
+    home = (df['vh'] == "H").to_numpy()
+    periods = df['period'].to_numpy()
+    elapsed = df['elapsed'].to_numpy()
+    shot = action.isin(["GOOD", "MISS"]).to_numpy()
+    made = (action == "GOOD").to_numpy()
+    free_throw = (play_type == "FT").to_numpy()
+    rebound = (action == "REBOUND").to_numpy()
+    turnover = (action == "TURNOVER").to_numpy()
+
+    # A shot is followed by free throws when the next shot is a free throw by the same team at the same time
+    shot_rows = np.flatnonzero(shot)
+    next_rows = np.append(shot_rows[1:], shot_rows[-1] if len(shot_rows) else 0)
+    trip_continues = np.zeros(len(df), dtype=bool)
+    trip_continues[shot_rows] = ((next_rows != shot_rows) & free_throw[next_rows] & (home[next_rows] == home[shot_rows])
+                                 & (elapsed[next_rows] == elapsed[shot_rows]))
+
+    # Rebounds change possession when they go to the team that did not take the last shot
+    shooter_home = pd.Series(np.where(shot, home, np.nan)).ffill().to_numpy()
+    defensive_rebound = rebound & ((play_type == "DEF").to_numpy()
+                                   | ((play_type == "DEADB").to_numpy() & (home != (shooter_home == 1))))
+
+    period_end = np.append(periods[1:] != periods[:-1], True)
+    ends = (made & ~trip_continues) | defensive_rebound | turnover | period_end
+
+    # The offense is whoever shot, turned it over or rebounded their own miss; a defensive rebound is the other side's
+    offense_home = np.where(defensive_rebound, ~home, home).astype(float)
+    offense_home[~(shot | turnover | rebound)] = np.nan
+    possession = np.concatenate([[0], np.cumsum(ends)[:-1]]).astype(np.int32)
+    possession_offense = pd.Series(offense_home).groupby(possession).last().to_numpy()[possession]
+
+    df['possession'] = possession
+    df['offense'] = pd.Categorical(np.where(possession_offense == 1, "H", np.where(possession_offense == 0, "V", "")))
+    return df
 
-    for index, row in df.iterrows():
-        lineup = tuple(sorted(eval(row['lineup'])))
-        if len(lineup) != 5:
-            continue
 
-        minutes, seconds = map(int, row['time'].split(':'))
-        current_seconds = minutes * 60 + seconds
-
-        # Detect half switch (clock reset)
-        if previous_seconds is not None and current_seconds > previous_seconds:
-            start_half = '2nd Half'
-
-        previous_seconds = current_seconds
-
-        if lineup != current_lineup:
-            if current_lineup:
-                end_time = row['time']
-                plus_minus = row['lead'] - start_lead
-                time_spent = calculate_time_diff_seconds(start_time, end_time)
-
-                lineup_data[current_lineup]["plus_minus"] += plus_minus
-                lineup_data[current_lineup]["total_seconds"] += time_spent
-
-            current_lineup = lineup
-            start_time = row['time']
-            start_lead = row['lead']
-
-    # Final stint
-    if current_lineup:
-        end_time = df['time'].iloc[-1]
-        plus_minus = df['lead'].iloc[-1] - start_lead
-        time_spent = calculate_time_diff_seconds(start_time, end_time)
-
-        lineup_data[current_lineup]["plus_minus"] += plus_minus
-        lineup_data[current_lineup]["total_seconds"] += time_spent
-
-    # Build output DataFrame
-    output_rows = []
-    for lineup, data in lineup_data.items():
-        minutes = data["total_seconds"] // 60
-        seconds = data["total_seconds"] % 60
-        time_str = f"{minutes:02d}:{seconds:02d}"
-        output_rows.append({
-            "Lineup": lineup,
-            "Plus/Minus": data["plus_minus"],
-            "Total Time": time_str
-        })
-
-    return pd.DataFrame(output_rows)
-
-
-def calculate_time_difference(start_time, end_time):
-    start_minutes, start_seconds = map(int, start_time.split(':'))
-    end_minutes, end_seconds = map(int, end_time.split(':'))
-    start_total_seconds = start_minutes * 60 + start_seconds
-    end_total_seconds = end_minutes * 60 + end_seconds
-    time_diff_seconds = end_total_seconds - start_total_seconds
-    minutes = abs(time_diff_seconds) // 60
-    seconds = abs(time_diff_seconds) % 60
-    return f"{minutes:02d}:{seconds:02d}"
-
-def generate_lineup_instances(df):
-    lineup_instances = []
-    current_lineup = None
-    start_time = None
-    start_lead = None
-    start_half = '1st Half'  # Start assuming 1st Half
-    previous_seconds = None
-
-    for index, row in df.iterrows():
-        lineup = tuple(eval(row['lineup']))
-        if len(lineup) == 5:
-            # Calculate current time in seconds
-            minutes, seconds = map(int, row['time'].split(':'))
-            current_seconds = minutes * 60 + seconds
-
-            # Detect if clock reset (start of second half)
-            if previous_seconds is not None and current_seconds > previous_seconds:
-                start_half = '2nd Half'
-
-            previous_seconds = current_seconds  # Update for next loop
-
-            if lineup != current_lineup:
-                if current_lineup:
-                    end_time = row['time']
-                    plus_minus = row['lead'] - start_lead
-                    total_time = calculate_time_difference(start_time, end_time)
-                    lineup_instances.append([current_lineup, start_time, end_time, plus_minus, total_time, start_half])
-                current_lineup = lineup
-                start_time = row['time']
-                start_lead = row['lead']
-
-    # Save the last stint
-    if current_lineup:
-        end_time = df['time'].iloc[-1]
-        plus_minus = df['lead'].iloc[-1] - start_lead
-        total_time = calculate_time_difference(start_time, end_time)
-        lineup_instances.append([current_lineup, start_time, end_time, plus_minus, total_time, start_half])
-
-    return pd.DataFrame(lineup_instances, columns=['Lineup', 'Start Time', 'End Time', 'Plus/Minus', 'Total Time', 'Half'])
+def build_stints(df, elms_vh, periods_df):
+    """
+    Splits the play table into stints: runs of consecutive plays with the same Elms lineup within one period.
+    Returns one row per stint with the lineup bitmask, period, start/end elapsed seconds,
+    start/end clock, points for/against Elms, plus-minus, seconds, number of players,
+    the STINT_EVENT_COLUMNS counts of each side and the possessions of each side (see segment_possessions).
+    - A stint begins at the substitution that brought its lineup on, or at the start of its period
+    - It ends where the next stint begins, or at the end of its period, so the first stint of the game starts at 0,
+      the last one runs to the final buzzer and the stints of a period add up to its length
+    - Zero-second stints in which nothing was scored or counted are dropped
+    Points and events on a play belong to the lineup on the floor for that play;
+    a possession belongs to the lineup on the floor when it ends.
+    """
+    lineups = df['lineup'].to_numpy()
+    periods = df['period'].to_numpy()
+    elapsed = df['elapsed'].to_numpy(dtype=np.int32)
+    score_for = df['score_h' if elms_vh == "H" else 'score_v'].to_numpy(dtype=np.int32)
+    score_against = df['score_v' if elms_vh == "H" else 'score_h'].to_numpy(dtype=np.int32)
+    elms_play = (df['vh'] == elms_vh).to_numpy()
+    events = np.column_stack([flags & side for flags in play_events(df).values()
+                              for side in (elms_play, ~elms_play)]).astype(np.int32)
+    possession = df['possession'].to_numpy()
+    possession_ends = np.append(possession[1:] != possession[:-1], True)
+    possessions = np.column_stack([possession_ends & (df['offense'] == side).to_numpy()
+                                   for side in (elms_vh, "V" if elms_vh == "H" else "H")]).astype(np.int32)
+
+    # A stint starts on the first play, wherever the lineup changes and wherever a new period starts
+    boundary = np.ones(len(lineups), dtype=bool)
+    boundary[1:] = (lineups[1:] != lineups[:-1]) | (periods[1:] != periods[:-1])
+    starts = np.flatnonzero(boundary)
+    stint_periods = periods[starts].astype(np.int32)
+    period_start = periods_df['start'].to_numpy()[stint_periods - 1]
+    period_end = periods_df['end'].to_numpy()[stint_periods - 1]
+
+    # Mid-period stints start at the time of the substitution, the last play of the previous stint
+    opens_period = np.ones(len(starts), dtype=bool)
+    opens_period[1:] = stint_periods[1:] != stint_periods[:-1]
+    start = np.where(opens_period, period_start, elapsed[starts - 1])
+    start = np.clip(start, period_start, period_end)
+    end = np.append(start[1:], 0)
+    end = np.where(np.append(opens_period[1:], True), period_end, np.maximum(end, start))
+
+    stints = pd.DataFrame({
+        'lineup': lineups[starts],
+        'period': periods[starts],
+        'start': start,
+        'end': end,
+        'start_clock': period_end - start,
+        'end_clock': period_end - end,
+        'points_for': np.add.reduceat(np.diff(score_for, prepend=0), starts),
+        'points_against': np.add.reduceat(np.diff(score_against, prepend=0), starts),
+    })
+    stints['seconds'] = stints['end'] - stints['start']
+    stints['plus_minus'] = stints['points_for'] - stints['points_against']
+    stints['players'] = popcount(stints['lineup'])
+    stints[STINT_EVENT_COLUMNS] = np.add.reduceat(events, starts, axis=0)
+    stints[['possessions_for', 'possessions_against']] = np.add.reduceat(possessions, starts, axis=0)
+
+    # Lineups that only existed between two substitutions at the same instant never played
+    played = ((stints['seconds'] > 0) | (stints['points_for'] > 0) | (stints['points_against'] > 0)
+              | stints[[*STINT_EVENT_COLUMNS, 'possessions_for', 'possessions_against']].any(axis=1))
+    return stints[played].reset_index(drop=True)
+
+
+def calculate_plus_minus(stints, players):
+    """Sums stint plus-minus and possessions for each player who was on the floor, with their ratings."""
+    lineups = stints['lineup'].to_numpy()
+    on_court = stints[POSSESSION_TOTALS].to_numpy()
+
+    player_ids = lineup_player_ids(np.bitwise_or.reduce(lineups, initial=0))
+    player_totals = pd.DataFrame([on_court[(lineups >> player_id) & 1 == 1].sum(axis=0) for player_id in player_ids],
+                                 columns=POSSESSION_TOTALS)
+
+    return pd.concat([pd.DataFrame({
+        'Player': [players[player_id] for player_id in player_ids],
+        'Plus/Minus': player_totals['points_for'] - player_totals['points_against'],
+        'Offensive Possessions': player_totals['possessions_for'],
+        'Defensive Possessions': player_totals['possessions_against'],
+    }), possession_ratings(player_totals)], axis=1)
+
+
+def generate_lineup_plus_minus(stints, players):
+    """
+    Calculates plus-minus, time on the floor and possessions for each unique 5-player lineup.
+    Returns a DataFrame with Lineup ID (bitmask), Lineup, Plus/Minus, Total Seconds, offensive/defensive possessions
+    and ratings.
+    """
+    lineup_totals = (
+        stints[stints['players'] == 5]
+        .groupby('lineup', sort=False)[['plus_minus', 'seconds', *POSSESSION_TOTALS]]
+        .sum()
+        .reset_index()
+    )
+
+    return pd.concat([pd.DataFrame({
+        "Lineup ID": lineup_totals['lineup'],
+        "Lineup": lineup_totals['lineup'].map(lambda lineup: lineup_label(lineup, players)),
+        "Plus/Minus": lineup_totals['plus_minus'],
+        "Total Seconds": lineup_totals['seconds'],
+        "Offensive Possessions": lineup_totals['possessions_for'],
+        "Defensive Possessions": lineup_totals['possessions_against'],
+    }), possession_ratings(lineup_totals)], axis=1)
+
+
+def generate_game_ratings(stints):
+    """One row of Elms team totals for the game: points and possessions of each side, and the ratings."""
+    game_totals = stints[POSSESSION_TOTALS].sum().to_frame().T
+
+    return pd.concat([pd.DataFrame({
+        "Points For": game_totals['points_for'],
+        "Points Against": game_totals['points_against'],
+        "Offensive Possessions": game_totals['possessions_for'],
+        "Defensive Possessions": game_totals['possessions_against'],
+        "Total Seconds": stints['seconds'].sum(),
+    }), possession_ratings(game_totals)], axis=1)
+
+
+def generate_lineup_instances(stints, players):
+    """Lists every 5-player stint with its start/end clock (seconds remaining), plus-minus, seconds and period."""
+    five_man = stints[stints['players'] == 5]
+
+    return pd.DataFrame({
+        'Lineup ID': five_man['lineup'],
+        'Lineup': five_man['lineup'].map(lambda lineup: lineup_label(lineup, players)),
+        'Start Clock': five_man['start_clock'],
+        'End Clock': five_man['end_clock'],
+        'Plus/Minus': five_man['plus_minus'],
+        'Total Seconds': five_man['seconds'],
+        'Period': five_man['period']
+    }).reset_index(drop=True)
 
 
 def calculate_metrics(lineup_instances_df):
     """
     Calculates plus-minus per minute and per 25 minutes for each 5-player lineup instance.
+    Rates of an instance with no time on the floor are left empty rather than infinite.
+    lineup_instances_df itself is left as is: it is saved with integer Total Seconds only.
     """
 
-    # Helper to convert 'MM:SS' format to total minutes as float
-    def time_to_minutes(time_str):
-        minutes, seconds = map(int, time_str.split(':'))
-        return minutes + seconds / 60
-
-    # 1. Convert Total Time to Minutes
-    lineup_instances_df['Total Time (Minutes)'] = lineup_instances_df['Total Time'].apply(time_to_minutes)
+    # 1. Convert Total Seconds to Minutes (zero-second instances have no rate)
+    seconds = lineup_instances_df['Total Seconds']
+    minutes = seconds.where(seconds > 0) / 60
 
     # 2. Calculate Plus-Minus Per Minute
-    lineup_instances_df['Plus/Minus Per Minute'] = (lineup_instances_df['Plus/Minus'] / lineup_instances_df['Total Time (Minutes)']).round(2)
+    per_minute = (lineup_instances_df['Plus/Minus'] / minutes).round(2)
 
     # 3. Calculate Plus-Minus Per 25 Minutes
-    lineup_instances_df['Plus/Minus Per 25 Minutes'] = (lineup_instances_df['Plus/Minus Per Minute'] * 25).round(2)
+    per_25_minutes = (per_minute * 25).round(2)
 
     # 4. Return Final Clean DataFrame
-    return lineup_instances_df[['Lineup', 'Plus/Minus Per 25 Minutes', 'Plus/Minus Per Minute', 'Total Time']]
+    return pd.DataFrame({
+        'Lineup ID': lineup_instances_df['Lineup ID'],
+        'Lineup': lineup_instances_df['Lineup'],
+        'Plus/Minus Per 25 Minutes': per_25_minutes,
+        'Plus/Minus Per Minute': per_minute,
+        'Total Seconds': seconds,
+    })
 
-import pandas as pd
 
 def merge_lineups(result_df):
     """
     Merges duplicate lineups in result_df by:
     - Adding Plus/Minus Per Minute
     - Adding Plus/Minus Per 25 Minutes
-    - Summing Total Time correctly
+    - Summing Total Seconds
     """
+    merged_df = (
+        result_df
+        .groupby(['Lineup ID', 'Lineup'], sort=False)[['Plus/Minus Per 25 Minutes', 'Plus/Minus Per Minute', 'Total Seconds']]
+        .sum()
+        .reset_index()
+    )
 
-    merged_lineups = {}
-
-    for _, row in result_df.iterrows():
-        # Force Lineup into a sorted tuple to ensure consistent matching
-        lineup = tuple(sorted(row['Lineup']))
-
-        if lineup not in merged_lineups:
-            merged_lineups[lineup] = {
-                'Plus/Minus Per 25 Minutes': 0,
-                'Plus/Minus Per Minute': 0,
-                'Total Seconds': 0  # Track total time cleanly
-            }
-
-        # Add Plus/Minus values
-        merged_lineups[lineup]['Plus/Minus Per 25 Minutes'] += row['Plus/Minus Per 25 Minutes']
-        merged_lineups[lineup]['Plus/Minus Per Minute'] += row['Plus/Minus Per Minute']
-
-        # Convert Total Time to seconds and add
-        minutes, seconds = map(int, row['Total Time'].split(":"))
-        total_seconds = minutes * 60 + seconds
-        merged_lineups[lineup]['Total Seconds'] += total_seconds
-
-    # Now build a clean DataFrame
-    merged_rows = []
-    for lineup, metrics in merged_lineups.items():
-        minutes = metrics['Total Seconds'] // 60
-        seconds = metrics['Total Seconds'] % 60
-        total_time_str = f"{minutes:02d}:{seconds:02d}"
-
-        merged_rows.append({
-            'Lineup': lineup,
-            'Plus/Minus Per 25 Minutes': round(metrics['Plus/Minus Per 25 Minutes'], 2),
-            'Plus/Minus Per Minute': round(metrics['Plus/Minus Per Minute'], 2),
-            'Total Time': total_time_str
-        })
-
-    merged_df = pd.DataFrame(merged_rows)
+    merged_df[['Plus/Minus Per 25 Minutes', 'Plus/Minus Per Minute']] = merged_df[['Plus/Minus Per 25 Minutes', 'Plus/Minus Per Minute']].round(2)
 
     return merged_df
-import pandas as pd
-from itertools import combinations
-
-def calculate_plus_minus_combinations(lineup_pm_df):
-    """
-    Calculates plus-minus for all two-player combinations from a lineup plus-minus DataFrame.
-    """
-    two_player_combinations = {}
-    
-    for _, row in lineup_pm_df.iterrows():
-        lineup = row['Lineup']
-        plus_minus = row['Plus/Minus']
-        
-        # Ensure lineup is a list
-        if isinstance(lineup, str):
-            import ast
-            try:
-                lineup = ast.literal_eval(lineup)
-            except:
-                continue
 
-        for combo in combinations(lineup, 2):  # Generate all 2-player combinations
-            combo = tuple(sorted(combo))  # Ensure consistent order
-            if combo not in two_player_combinations:
-                two_player_combinations[combo] = 0
-            two_player_combinations[combo] += plus_minus
-    
-    # Convert to DataFrame
-    combinations_df = pd.DataFrame([(p1, p2, pm) for (p1, p2), pm in two_player_combinations.items()],
-    columns=['Player 1', 'Player 2', 'Plus/Minus']
-)
 
-    
-    return combinations_df
+def combination_totals(stints, size):
+    """
+    Sums COMBINATION_TOTALS over every `size`-player subset of the 5-player stints, indexed by the subset's bitmask
+    ("combination").
+    Stints are summed per distinct lineup first; the C(5, size) subset keys of all lineups are then built as one
+    int64 array and grouped, so nothing loops over stints or subsets in Python.
+    """
+    lineup_totals = stints[stints['players'] == LINEUP_SIZE].groupby('lineup', sort=False)[COMBINATION_TOTALS].sum()
+    members = lineup_members(lineup_totals.index.to_numpy(dtype=np.int64))
+    slots = np.array(list(combinations(range(LINEUP_SIZE), size)), dtype=np.int64).reshape(-1, size)
 
+    keys = np.bitwise_or.reduce(np.int64(1) << members[:, slots], axis=2).ravel()
+    values = np.repeat(lineup_totals.to_numpy(dtype=np.int64), len(slots), axis=0)
+    return pd.DataFrame(values, columns=COMBINATION_TOTALS).groupby(pd.Index(keys, name="combination")).sum()
 
 
-def generate_boxscore_from_xml(file_path):
-    """Parses an XML file and generates the player-level boxscore DataFrame."""
-    tree = ET.parse(file_path)
-    root = tree.getroot()
+def combination_table(totals, players, size):
+    """
+    One row per combination of combination_totals (or the season's): Combination ID (bitmask), the players' IDs and
+    names in name order (Player 1 ID.., Player 1..), plus-minus, seconds, points, possessions and ratings.
+    """
+    members = name_order(lineup_members(totals.index.to_numpy(dtype=np.int64), size), players)
+    names = np.asarray(players, dtype=object)
 
-    player_stats_data = []
+    table_df = pd.DataFrame({"Combination ID": totals.index.to_numpy(dtype=np.int64)})
+    for slot in range(size):
+        table_df[f"Player {slot + 1} ID"] = members[:, slot]
+    for slot in range(size):
+        table_df[f"Player {slot + 1}"] = names[members[:, slot]]
+    table_df["Plus/Minus"] = (totals['points_for'] - totals['points_against']).to_numpy()
+    table_df["Total Seconds"] = totals['seconds'].to_numpy()
+    table_df["Points For"] = totals['points_for'].to_numpy()
+    table_df["Points Against"] = totals['points_against'].to_numpy()
+    table_df["Offensive Possessions"] = totals['possessions_for'].to_numpy()
+    table_df["Defensive Possessions"] = totals['possessions_against'].to_numpy()
+    return pd.concat([table_df, possession_ratings(totals).reset_index(drop=True)], axis=1)
 
-    for team in root.findall(".//team"):
-        for player in team.findall(".//player"):
-            stats = player.find(".//stats")
-            if stats is not None:
-                player_stats_data.append({
-                    "Team": team.get("name"),
-                    "Player": player.get("name"),
-                    "No.": player.get("uni"),
-                    "MIN": stats.get("min"),
-                    "FGM": stats.get("fgm"),
-                    "FGA": stats.get("fga"),
-                    "FG%": stats.get("fgpct"),
-                    "3PM": stats.get("fgm3"),
-                    "3PA": stats.get("fga3"),
-                    "3P%": stats.get("fg3pct"),
-                    "FTM": stats.get("ftm"),
-                    "FTA": stats.get("fta"),
-                    "FT%": stats.get("ftpct"),
-                    "OREB": stats.get("oreb"),
-                    "DREB": stats.get("dreb"),
-                    "REB": stats.get("treb"),
-                    "AST": stats.get("ast"),
-                    "STL": stats.get("stl"),
-                    "BLK": stats.get("blk"),
-                    "TO": stats.get("to"),
-                    "PF": stats.get("pf"),
-                    "PTS": stats.get("tp"),
-                })
 
-    boxscore_df = pd.DataFrame(player_stats_data)
+def calculate_plus_minus_combinations(stints, players):
+    """Plus-minus, time on the floor, possessions and ratings of every two-player combination in a 5-player stint."""
+    return combination_table(combination_totals(stints, 2), players, 2)
+
 
-    boxscore_df = boxscore_df[[
-        "Team", "No.", "Player", "MIN", "FGM", "FGA", "FG%", "3PM", "3PA", "3P%",
-        "FTM", "FTA", "FT%", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TO", "PF", "PTS"
-    ]]
+def generate_boxscore(player_stats_data):
+    """
+    Generates the player-level boxscore DataFrame from the parsed <stats> rows.
+    The <stats> attributes are typed once here: counting stats as integers, shooting percentages as decimals.
+    """
+    boxscore_df = pd.DataFrame(player_stats_data, columns=["Team", "No.", "Player", *BOXSCORE_STATS])
+    boxscore_df[COUNT_COLUMNS] = (boxscore_df[COUNT_COLUMNS].apply(pd.to_numeric, errors="coerce")
+                                  .fillna(0).astype("int64"))
+    boxscore_df[PERCENT_COLUMNS] = boxscore_df[PERCENT_COLUMNS].apply(pd.to_numeric, errors="coerce")
 
     return boxscore_df
 
-def generate_team_stats_from_xml(file_path):
-    """Parses an XML file and generates the team-level totals DataFrame."""
-    tree = ET.parse(file_path)
-    root = tree.getroot()
 
-    team_stats_data = []
+def rate(numerator, denominator):
+    """100 * numerator / denominator, rounded to 2 places; empty (NaN) wherever the denominator is 0."""
+    denominator = np.asarray(denominator, dtype="float64")
+    ratio = np.divide(100 * np.asarray(numerator, dtype="float64"), denominator,
+                      out=np.full(len(denominator), np.nan), where=denominator != 0)
+    return pd.Series(ratio.round(2), index=numerator.index)
 
-    for team_element in root.findall(".//team"):
-        team_name = team_element.get("name")
-        team_data = {
-            "Team": team_name,
-            "MIN": 0, "FGM": 0, "FGA": 0, "3PM": 0, "3PA": 0, "FTM": 0, "FTA": 0,
-            "OREB": 0, "DREB": 0, "REB": 0, "AST": 0, "STL": 0, "BLK": 0,
-            "TO": 0, "PF": 0, "PTS": 0
-        }
 
-        for player in team_element.findall(".//player"):
-            stats = player.find(".//stats")
-            if stats is not None:
-                team_data["MIN"] += int(stats.get("min", 0)) if stats.get("min") else 0
-                team_data["FGM"] += int(stats.get("fgm", 0)) if stats.get("fgm") else 0
-                team_data["FGA"] += int(stats.get("fga", 0)) if stats.get("fga") else 0
-                team_data["3PM"] += int(stats.get("fgm3", 0)) if stats.get("fgm3") else 0
-                team_data["3PA"] += int(stats.get("fga3", 0)) if stats.get("fga3") else 0
-                team_data["FTM"] += int(stats.get("ftm", 0)) if stats.get("ftm") else 0
-                team_data["FTA"] += int(stats.get("fta", 0)) if stats.get("fta") else 0
-                team_data["OREB"] += int(stats.get("oreb", 0)) if stats.get("oreb") else 0
-                team_data["DREB"] += int(stats.get("dreb", 0)) if stats.get("dreb") else 0
-                team_data["REB"] += int(stats.get("treb", 0)) if stats.get("treb") else 0
-                team_data["AST"] += int(stats.get("ast", 0)) if stats.get("ast") else 0
-                team_data["STL"] += int(stats.get("stl", 0)) if stats.get("stl") else 0
-                team_data["BLK"] += int(stats.get("blk", 0)) if stats.get("blk") else 0
-                team_data["TO"] += int(stats.get("to", 0)) if stats.get("to") else 0
-                team_data["PF"] += int(stats.get("pf", 0)) if stats.get("pf") else 0
-                team_data["PTS"] += int(stats.get("tp", 0)) if stats.get("tp") else 0
-
-        # Calculate team shooting percentages
-        team_data["FG%"] = round((team_data["FGM"] / team_data["FGA"]) * 100, 2) if team_data["FGA"] != 0 else 0
-        team_data["3P%"] = round((team_data["3PM"] / team_data["3PA"]) * 100, 2) if team_data["3PA"] != 0 else 0
-        team_data["FT%"] = round((team_data["FTM"] / team_data["FTA"]) * 100, 2) if team_data["FTA"] != 0 else 0
-
-        team_stats_data.append(team_data)
-
-    team_stats_df = pd.DataFrame(team_stats_data)
-
-    team_stats_df = team_stats_df[[
-        "Team", "MIN", "FGM", "FGA", "FG%", "3PM", "3PA", "3P%", "FTM", "FTA", "FT%",
-        "OREB", "DREB", "REB", "AST", "STL", "BLK", "TO", "PF", "PTS"
-    ]]
-
-    return team_stats_df
-
-
-def calculate_oreb_rate(df, team_stats_df):
-    """Calculates the Offensive Rebound Rate (OREB%) for players/teams."""
-
-    def get_opponent_dreb(row):
-        current_team = row['Team']
-        opponent_team = [team for team in team_stats_df['Team'] if team != current_team]
-        if opponent_team:
-            opponent_dreb = team_stats_df[team_stats_df['Team'] == opponent_team[0]]['DREB'].iloc[0]
-            return float(opponent_dreb)
-        return 0
-
-    df['Opponent DREB'] = df.apply(get_opponent_dreb, axis=1)
-
-    # Calculate OREB%
-    df['OREB'] = pd.to_numeric(df['OREB'], errors='coerce').fillna(0)
-    df['OREB%'] = (df['OREB'] / (df['OREB'] + df['Opponent DREB']) * 100).round(2)
-
-    df = df.drop('Opponent DREB', axis=1)
-    return df
-
-def calculate_tov_rate(df):
-    """Calculates the Turnover Rate (TOV%)."""
-    
-    df['TO'] = pd.to_numeric(df['TO'], errors='coerce').fillna(0)
-    df['FGA'] = pd.to_numeric(df['FGA'], errors='coerce').fillna(0)
-    df['FTA'] = pd.to_numeric(df['FTA'], errors='coerce').fillna(0)
-
-    df['TOV%'] = (df['TO'] / (df['FGA'] + 0.44 * df['FTA'] + df['TO']) * 100).round(2)
-    return df
+def possession_ratings(totals):
+    """
+    Offensive, defensive and net rating (points scored, allowed and their difference per 100 possessions)
+    from summed points_for/against and possessions_for/against; empty for a side with no possessions.
+    """
+    offensive = rate(totals['points_for'], totals['possessions_for'])
+    defensive = rate(totals['points_against'], totals['possessions_against'])
+    return pd.DataFrame({
+        "Offensive Rating": offensive,
+        "Defensive Rating": defensive,
+        "Net Rating": (offensive - defensive).round(2),
+    })
 
-def calculate_efg_percentage(df):
-    """Calculates Effective Field Goal Percentage (EFG%)."""
-    
-    df['FGM'] = pd.to_numeric(df['FGM'], errors='coerce').fillna(0)
-    df['3PM'] = pd.to_numeric(df['3PM'], errors='coerce').fillna(0)
-    df['FGA'] = pd.to_numeric(df['FGA'], errors='coerce').fillna(0)
 
-    df['EFG%'] = (((df['FGM'] + 0.5 * df['3PM']) / df['FGA']) * 100).round(2)
+def calculate_four_factors(boxscore_df):
+    """
+    Adds the Four Factors to a typed boxscore, for one game or for a whole season in one call
+    (rows are grouped into games by their "Game" column when there is one):
+    - OREB% = OREB / (OREB + opponent DREB)
+    - TOV% = TO / (FGA + 0.44 * FTA + TO)
+    - EFG% = (FGM + 0.5 * 3PM) / FGA
+    - FTR = FTA / FGA
+    Opponent DREB is joined per game and team: the game's total minus the team's own.
+    A factor whose denominator is 0 is left empty rather than reported as 0 or infinite.
+    """
+    df = boxscore_df.copy()
+    games = df["Game"] if "Game" in df.columns else pd.Series(0, index=df.index)
+    team_dreb = df.groupby([games, df["Team"]], sort=False)["DREB"].transform("sum")
+    opponent_dreb = df.groupby(games, sort=False)["DREB"].transform("sum") - team_dreb
+
+    df["OREB%"] = rate(df["OREB"], df["OREB"] + opponent_dreb)
+    df["TOV%"] = rate(df["TO"], df["FGA"] + 0.44 * df["FTA"] + df["TO"])
+    df["EFG%"] = rate(df["FGM"] + 0.5 * df["3PM"], df["FGA"])
+    df["FTR"] = rate(df["FTA"], df["FGA"])
     return df
 
-def calculate_ftr(df):
-    """Calculates Free Throw Rate (FTR)."""
 
-    df['FTA'] = pd.to_numeric(df['FTA'], errors='coerce').fillna(0)
-    df['FGA'] = pd.to_numeric(df['FGA'], errors='coerce').fillna(0)
-
-    df['FTR'] = (df['FTA'] / df['FGA'] * 100).round(2)
-    return df
-
-def create_four_factors_summary(final_boxscore_df):
+def lineup_four_factors(totals):
+    """
+    Four Factors from summed STINT_EVENT_COLUMNS counts (one row per lineup, game or season),
+    for Elms and for the opponent while that lineup was on the floor ("Opp" columns).
+    OREB% is against the other side's defensive rebounds; a zero denominator leaves the factor empty.
+    """
+    factors = pd.DataFrame(index=totals.index)
+    for prefix, side, other in [("", "for", "against"), ("Opp ", "against", "for")]:
+        fga, fta, tov, oreb = (totals[f"{event}_{side}"] for event in ["fga", "fta", "tov", "oreb"])
+        factors[f"{prefix}OREB%"] = rate(oreb, oreb + totals[f"dreb_{other}"])
+        factors[f"{prefix}TOV%"] = rate(tov, fga + 0.44 * fta + tov)
+        factors[f"{prefix}EFG%"] = rate(totals[f"fgm_{side}"] + 0.5 * totals[f"fg3m_{side}"], fga)
+        factors[f"{prefix}FTR"] = rate(fta, fga)
+    return factors
+
+
+def generate_lineup_four_factors(stints, players):
+    """Four Factors of each 5-player lineup and of its opponents, from the event counts of its stints."""
+    lineup_totals = (
+        stints[stints['players'] == 5]
+        .groupby('lineup', sort=False)[['seconds', *STINT_EVENT_COLUMNS]]
+        .sum()
+    )
+
+    lineup_df = pd.DataFrame({
+        "Lineup ID": lineup_totals.index,
+        "Lineup": lineup_totals.index.map(lambda lineup: lineup_label(lineup, players)),
+        "Total Seconds": lineup_totals['seconds'].to_numpy(),
+    })
+    return pd.concat([lineup_df, lineup_four_factors(lineup_totals).reset_index(drop=True)], axis=1)
+
+
+def create_four_factors_summary(final_boxscore_df, canonical_names):
     """
     Creates a Four Factors summary DataFrame:
-    - Only includes Elms players (case-insensitive match)
-    - Drops any players with missing Four Factors
+    - Only includes Elms players, named by their canonical registry name
+    - Drops players with none of the Four Factors (a single undefined factor is left empty)
     - No rankings included
     """
 
-    # Step 1: Filter for Elms players (case insensitive)
-    elms_df = final_boxscore_df[final_boxscore_df['Team'].str.contains('elms', case=False, na=False)].copy()
+    # Step 1: Filter for Elms players (resolved by the roster registry)
+    elms_df = final_boxscore_df[canonical_names.notna()].copy()
+    elms_df['Player'] = canonical_names.dropna()
 
     # Step 2: Select only Player and Four Factors
     four_factors_summary_df = elms_df[['Player', 'OREB%', 'TOV%', 'EFG%', 'FTR']].copy()
 
-    # Step 3: Drop any rows where Four Factors are missing
-    four_factors_summary_df = four_factors_summary_df.dropna(subset=['OREB%', 'TOV%', 'EFG%', 'FTR'])
+    # Step 3: Drop rows where every Four Factor is missing
+    four_factors_summary_df = four_factors_summary_df.dropna(subset=['OREB%', 'TOV%', 'EFG%', 'FTR'], how='all')
 
     return four_factors_summary_df
 
@@ -508,73 +663,259 @@ def create_four_factors_summary(final_boxscore_df):
 
 
 
-# Path to your XML file
-# 
-import os
-print(os.getcwd())
-
-if __name__ == "__main__":
-    folder_path = "Games/"  # Folder containing XML files
-    output_folder = "Output/Games/"  # Folder to save CSVs
-
+def process_game(file_path, output_folder, registry, instrumentation=None, store_folder=STORE_FOLDER):
+    """
+    Runs the full pipeline for one game file and writes its CSVs to output_folder
+    (and to the columnar store in store_folder, when pyarrow is installed).
+    Each step runs as a stage of instrumentation (see instrument.Instrumentation), which only measures when enabled.
+    Returns the paths of the artifacts written, the game's content fingerprint and its catalog entry.
+    """
+    base_name = os.path.splitext(os.path.basename(file_path))[0]  # filename without .xml
+    stages = instrumentation or Instrumentation(enabled=False)
+
+    # 1. Parse XML (single pass: plays, boxscore, venue)
+    with stages.stage("parse") as stage:
+        game = parse_game(file_path)
+        fingerprint = game_fingerprint(game)  # before any later stage modifies the parsed tables
+        stage["rows_out"] = len(game.plays)
+    df = game.plays
+
+    # 2. Resolve the Elms roster once per game through the persistent registry
+    with stages.stage("name matching", rows_in=len(df)) as stage:
+        canonical_names = registry.resolve_roster(game.roster)
+        player_names = canonical_names.dropna().tolist()
+        player_ids = {name: registry.ids[name] for name in player_names}
+        df = match_player_names(df, game.roster, canonical_names)
+        stage["rows_out"] = len(player_names)
+
+    # 3. Process
+    with stages.stage("lineup reconstruction", rows_in=len(df)) as stage:
+        starters = find_starters(df, player_names)
+        df = update_lineup(df, player_ids, starters)
+        stage["rows_out"] = len(df)
+
+    # 4. One stints table feeds every lineup output
+    with stages.stage("stints", rows_in=len(df)) as stage:
+        df = segment_possessions(df)
+        stints = build_stints(df, elms_side(game.venue), game.periods)
+        stage["rows_out"] = len(stints)
+
+    with stages.stage("lineup merge", rows_in=len(stints)) as stage:
+        plus_minus_df = calculate_plus_minus(stints, registry.players)
+        lineup_pm_df = generate_lineup_plus_minus(stints, registry.players)
+        lineup_instances_df = generate_lineup_instances(stints, registry.players)
+        result_df = calculate_metrics(lineup_instances_df)
+        merged_results_df = merge_lineups(result_df)
+        combinations_df = calculate_plus_minus_combinations(stints, registry.players)
+        game_ratings_df = generate_game_ratings(stints)
+        stage["rows_out"] = len(lineup_pm_df) + len(merged_results_df) + len(combinations_df) + len(game_ratings_df)
+
+    with stages.stage("four factors", rows_in=len(game.boxscore)) as stage:
+        final_boxscore_df = calculate_four_factors(game.boxscore)
+        four_factors_summary_df = create_four_factors_summary(final_boxscore_df, canonical_names)
+        lineup_four_factors_df = generate_lineup_four_factors(stints, registry.players)
+        stage["rows_out"] = len(four_factors_summary_df) + len(lineup_four_factors_df)
+
+    # 5. Save all outputs, each with a "Game" column (Dean, Anna_Maria, etc.)
+    outputs = {
+        "stints": stints,
+        "plus_minus": plus_minus_df,
+        "lineup_pm": lineup_pm_df,
+        "game_ratings": game_ratings_df,
+        "lineup_instances": lineup_instances_df,
+        "result_metrics": result_df,
+        "merged_lineups": merged_results_df,
+        "two_player_combinations": combinations_df,
+        "boxscore": final_boxscore_df,
+        "four_factors_summary": four_factors_summary_df,
+        "lineup_four_factors": lineup_four_factors_df,
+    }
+
+    with stages.stage("write", rows_in=sum(len(output_df) for output_df in outputs.values())) as stage:
+        csv_paths = {}
+        for artifact, output_df in outputs.items():
+            output_df["Game"] = base_name
+            csv_paths[artifact] = os.path.join(output_folder, f"{base_name}_{artifact}.csv")
+            output_df.to_csv(csv_paths[artifact], index=False)
+        artifact_paths = list(csv_paths.values())
+
+        # 6. Same outputs as a columnar store partitioned by season and game
+        artifact_paths += write_game(outputs, season_label(game.venue), base_name, store_folder)
+        stage["rows_out"] = len(artifact_paths)
+
+    return artifact_paths, fingerprint, catalog_entry(game.venue, csv_paths)
+
+
+def scan_roster(file_path):
+    """Reads only the <team>/<player> elements of a game file, stopping before the play-by-play."""
+    roster_data = []
+    team_name = None
+    team_id = None
+
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            if elem.tag == "team":
+                team_name = elem.get("name")
+                team_id = elem.get("id")
+            elif elem.tag == "plays":
+                break
+        elif elem.tag == "player":
+            roster_data.append({
+                "Team": team_name, "team_id": team_id, "Player": elem.get("name"),
+                "checkname": elem.get("checkname", ""), "playerId": elem.get("playerId", "")
+            })
+            elem.clear()
+
+    return pd.DataFrame(roster_data, columns=["Team", "team_id", "Player", "checkname", "playerId"])
+
+
+def run_game(file_path, output_folder, registry, instrument=False):
+    """
+    Batch worker: processes one game and reports its status and timing instead of raising.
+    With instrument, the result also carries the game's per-stage records ("stages").
+    """
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    instrumentation = Instrumentation(enabled=instrument, game=name)
+    start = time.perf_counter()
+    try:
+        artifacts, fingerprint, catalog = process_game(file_path, output_folder, registry, instrumentation)
+        return {"file": file_path, "status": "ok", "seconds": time.perf_counter() - start,
+                "artifacts": artifacts, "fingerprint": fingerprint, "catalog": catalog, "error": None,
+                "stages": instrumentation.records}
+    except Exception as error:
+        return {"file": file_path, "status": "failed", "seconds": time.perf_counter() - start,
+                "artifacts": [], "fingerprint": None, "catalog": None, "error": f"{type(error).__name__}: {error}",
+                "stages": instrumentation.records}
+
+
+def run_batch(folder_path, output_folder, workers=None, force=False, report=None, profile=None):
+    """
+    Processes the game XMLs in folder_path that are new or changed since the last run,
+    across a pool of worker processes.
+    - The manifest (manifest.MANIFEST_PATH) records each game's content hash, code version,
+      roster signature and artifacts; a game is skipped when all of them are unchanged
+    - Games whose parsed content matches another game's are flagged with "duplicate_of"
+    - The game catalog (catalog.CATALOG_PATH) is rewritten from the manifest after every run
+    - Games are handled in sorted filename order and results are reported in that order
+    - Every Elms player is registered before fanning out, so Player IDs don't depend on scheduling
+    - A game that fails is reported and skipped; the rest of the batch still runs
+    - With report, every game's per-stage wall/CPU time, rows and memory peak are appended to that JSONL file
+    - With profile, the slowest game is run again under cProfile and its stats are dumped to that path
+    """
     os.makedirs(output_folder, exist_ok=True)
+    if not store_available():
+        print("⚠️ pyarrow is not installed; writing CSVs only, without the columnar store")
+
+    file_paths = [os.path.join(folder_path, filename) for filename in sorted(os.listdir(folder_path))
+                  if filename.lower().endswith(".xml")]
+
+    manifest = load_manifest()
+    version = code_version()
+    games = {os.path.splitext(os.path.basename(file_path))[0]: file_path for file_path in file_paths}
+    hashes = {name: file_sha256(file_path) for name, file_path in games.items()}
+    stale = [name for name in games
+             if force or not is_up_to_date(manifest["games"].get(name), hashes[name], version)]
+
+    # Register every Elms player in the games about to be rebuilt
+    registry = RosterRegistry()
+    results = []
+    signatures = {}
+    for name in stale:
+        try:
+            signatures[name] = roster_signature(registry, scan_roster(games[name]))
+        except Exception as error:
+            results.append({"file": games[name], "status": "failed", "seconds": 0.0, "artifacts": [],
+                            "fingerprint": None, "catalog": None, "error": f"{type(error).__name__}: {error}",
+                            "stages": []})
+    registry.save()
+
+    # If the alias table changed, rebuild any skipped game whose players now resolve differently
+    roster_version = file_sha256(registry.path)
+    if roster_version != manifest["roster_version"]:
+        for name in games:
+            if name in stale:
+                continue
+            signature = roster_signature(registry, scan_roster(games[name]))
+            if signature != manifest["games"][name].get("roster"):
+                stale.append(name)
+                signatures[name] = signature
+        registry.save()
+        roster_version = file_sha256(registry.path)
+
+    failed_scans = {result["file"] for result in results}
+    game_paths = sorted(games[name] for name in stale if games[name] not in failed_scans)
+
+    batch_start = time.perf_counter()
+    instrument = report is not None
+    if workers == 1 or len(game_paths) <= 1:
+        results += [run_game(file_path, output_folder, registry, instrument) for file_path in game_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results += pool.map(run_game, game_paths, repeat(output_folder), repeat(registry), repeat(instrument))
+    results.sort(key=lambda result: result["file"])
+
+    # Update the manifest: drop games whose XML is gone (with their CSVs and store partitions), record every rebuilt game
+    for name in set(manifest["games"]) - set(games):
+        for path in manifest["games"][name].get("artifacts") or []:
+            if os.path.exists(path):
+                os.remove(path)
+        remove_game(name)
+    manifest["games"] = {name: entry for name, entry in manifest["games"].items() if name in games}
+    for result in results:
+        name = os.path.splitext(os.path.basename(result["file"]))[0]
+        manifest["games"][name] = {
+            "source": result["file"], "sha256": hashes[name], "fingerprint": result["fingerprint"],
+            "code_version": version, "roster": signatures.get(name), "artifacts": result["artifacts"],
+            "catalog": result["catalog"], "status": result["status"], "error": result["error"],
+        }
+    mark_duplicates(manifest["games"])
+    manifest["code_version"] = version
+    manifest["roster_version"] = roster_version
+    save_manifest(manifest)
+    write_catalog(manifest["games"])
+
+    for result in results:
+        filename = os.path.basename(result["file"])
+        if result["status"] == "ok":
+            print(f"✅ Finished processing {filename} in {result['seconds']:.2f}s")
+        else:
+            print(f"❌ Failed processing {filename}: {result['error']}")
+
+    for name, entry in sorted(manifest["games"].items()):
+        if entry["duplicate_of"]:
+            print(f"⚠️ {name} has the same content as {entry['duplicate_of']}; it is left out of the season")
+
+    if report:
+        write_report(report, [record for result in results for record in result["stages"]],
+                     run=run_id(), script="analytics", code_version=version)
+        print(f"✅ Appended per-stage timings for {len(results)} games to {report}")
+
+    built = [result for result in results if result["status"] == "ok"]
+    if profile and built:
+        slowest = max(built, key=lambda result: result["seconds"])
+        # Rerun it into a scratch folder so the profiled run leaves the real CSVs and store untouched
+        with tempfile.TemporaryDirectory() as scratch, contextlib.redirect_stdout(io.StringIO()):
+            profile_call(profile, process_game, slowest["file"], scratch, registry, None,
+                         os.path.join(scratch, "Store"))
+        print(f"✅ Profiled the slowest game, {os.path.basename(slowest['file'])} ({slowest['seconds']:.2f}s), "
+              f"to {profile}")
+
+    failed = sum(result["status"] != "ok" for result in results)
+    print(f"✅ Processed {len(results) - failed}/{len(results)} changed games "
+          f"({len(games) - len(results)} unchanged skipped) in {time.perf_counter() - batch_start:.2f}s")
+    return results
+
 
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".xml") or filename.endswith(".XML"):
-            file_path = os.path.join(folder_path, filename)
-            base_name = os.path.splitext(filename)[0]  # filename without .xml
-
-            # 1. Parse XML
-            df, root = parse_xml_to_df(file_path)
-
-            # 2. Define player names (this could eventually be smarter, but use static list for now)
-            player_names = ["SMITH,HEAVEN", "GUERRIER,PHONIA", "PACHECO,MIA", "TURCO,MARY", "WASIEWICZ,GABBY",
-                            "LEWIS,JADE","URIBE,TALIA","GORSKI,JENNY","BARRON,SHEA","LEBEL,KELLY","ASFAW,SOLIYANA",
-                            "JOHNSTON,RAHMIA","GRAHAM,PIPER","ANDRADE,SOPHIA","MILDNER,STEPHANIE"]
-
-            # 3. Process
-            df = match_player_names(df, player_names)
-            starters = find_starters(df, player_names)
-            df = update_lineup(df, player_names, starters)
-
-            plus_minus_df = calculate_plus_minus(df)
-            lineup_pm_df = generate_lineup_plus_minus(df)
-            lineup_instances_df = generate_lineup_instances(df)
-            result_df = calculate_metrics(lineup_instances_df)
-            merged_results_df = merge_lineups(result_df)
-            combinations_df = calculate_plus_minus_combinations(lineup_pm_df)
-
-            final_boxscore_df = generate_boxscore_from_xml(file_path)
-            team_stats_df = generate_team_stats_from_xml(file_path)
-
-            final_boxscore_df = calculate_oreb_rate(final_boxscore_df, team_stats_df)
-            final_boxscore_df = calculate_tov_rate(final_boxscore_df)
-            final_boxscore_df = calculate_efg_percentage(final_boxscore_df)
-            final_boxscore_df = calculate_ftr(final_boxscore_df)
-
-            four_factors_summary_df = create_four_factors_summary(final_boxscore_df)
-
-            game_name = base_name  # Extracted from filename (Dean, Anna_Maria, etc.)
-
-# Add "Game" column to each relevant DataFrame
-            plus_minus_df["Game"] = game_name
-            lineup_pm_df["Game"] = game_name
-            lineup_instances_df["Game"] = game_name
-            result_df["Game"] = game_name
-            merged_results_df["Game"] = game_name
-            combinations_df["Game"] = game_name
-            final_boxscore_df["Game"] = game_name
-            four_factors_summary_df["Game"] = game_name
-
-
-            # 4. Save all outputs
-            plus_minus_df.to_csv(os.path.join(output_folder, f"{base_name}_plus_minus.csv"), index=False)
-            lineup_pm_df.to_csv(os.path.join(output_folder, f"{base_name}_lineup_pm.csv"), index=False)
-            lineup_instances_df.to_csv(os.path.join(output_folder, f"{base_name}_lineup_instances.csv"), index=False)
-            result_df.to_csv(os.path.join(output_folder, f"{base_name}_result_metrics.csv"), index=False)
-            merged_results_df.to_csv(os.path.join(output_folder, f"{base_name}_merged_lineups.csv"), index=False)
-            combinations_df.to_csv(os.path.join(output_folder, f"{base_name}_two_player_combinations.csv"), index=False)
-            final_boxscore_df.to_csv(os.path.join(output_folder, f"{base_name}_boxscore.csv"), index=False)
-            four_factors_summary_df.to_csv(os.path.join(output_folder, f"{base_name}_four_factors_summary.csv"), index=False)
-
-            print(f"✅ Finished processing {filename}")
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build per-game analytics CSVs from PrestoSports XML files.")
+    parser.add_argument("--games", default="Games/", help="Folder containing XML files")
+    parser.add_argument("--output", default="Output/Games/", help="Folder to save CSVs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument("--force", action="store_true", help="Rebuild every game, even if unchanged")
+    parser.add_argument("--report", help="Append per-stage timings of every rebuilt game to this JSONL file")
+    parser.add_argument("--profile", help="Run the slowest game again under cProfile and dump its stats here")
+    args = parser.parse_args()
+
+    run_batch(args.games, args.output, args.workers, args.force, args.report, args.profile)
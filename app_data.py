@@ -0,0 +1,198 @@
+import io
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from catalog import CATALOG_PATH, load_catalog
+from roster import lineup_mask
+
+# Prebuilt by Season_Merge.py: the season CSVs and the game catalog, parsed, in the one file the app loads at boot
+SNAPSHOT_PATH = "Output/Season/app_snapshot.pkl"
+
+# Rendered plots kept by the figure cache, and the resolution they are rendered at
+FIGURE_CACHE_SIZE = 64
+FIGURE_DPI = 100
+
+
+def file_version(path):
+    """Identifies the current contents of a file by modification time and size (None if missing)."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def build_pair_index(pairs_df):
+    """
+    Inverted index over a two-player table: (lower Player ID, higher Player ID) -> that pair's rows.
+    Works for season totals (one row per pair) and game-by-game listings (one row per pair and game).
+    """
+    if pairs_df.empty or "Player 1 ID" not in pairs_df.columns:
+        return {}
+    first, second = pairs_df["Player 1 ID"], pairs_df["Player 2 ID"]
+    low = first.where(first < second, second).rename("low")
+    high = first.where(first > second, second).rename("high")
+    return {(int(key[0]), int(key[1])): rows.reset_index(drop=True)
+            for key, rows in pairs_df.groupby([low, high], sort=False)}
+
+
+class LineupIndex:
+    """
+    Query engine over a lineup table with one row per "Lineup ID" (bitmask), kept in descending Plus/Minus order.
+    - Plus/minus ranges are binary-searched slices of the sorted column
+    - "Lineups containing all of these players" is a vectorized (mask & query) == query
+    """
+
+    def __init__(self, lineups_df):
+        self.frame = lineups_df.sort_values("Plus/Minus", ascending=False, kind="stable").reset_index(drop=True)
+        self.negated_plus_minus = -self.frame["Plus/Minus"].to_numpy()  # ascending, for searchsorted
+        self.masks = self.frame["Lineup ID"].to_numpy(dtype=np.int64)
+
+    def query(self, ranges, player_ids=()):
+        """Rows with Plus/Minus inside any of the inclusive (low, high) ranges whose lineup has every player."""
+        selected = np.zeros(len(self.frame), dtype=bool)
+        for low, high in ranges:
+            start = np.searchsorted(self.negated_plus_minus, -high, side="left")
+            end = np.searchsorted(self.negated_plus_minus, -low, side="right")
+            selected[start:end] = True
+        if player_ids:
+            players_mask = np.int64(lineup_mask(player_ids))
+            selected &= (self.masks & players_mask) == players_mask
+        return self.frame[selected]
+
+
+class DataLayer:
+    """
+    Process-wide cache of the CSV artifacts the app reads, shared by every session.
+    - Each file is parsed once and reused until its modification time or size changes
+    - Derived frames are cached against the versions of the files they were built from
+    - Frames are shared between sessions: callers copy a frame before modifying it
+    """
+
+    def __init__(self):
+        self._frames = {}  # key -> (version, DataFrame)
+        self._lock = threading.RLock()
+
+    def _cached(self, key, version, build):
+        cached = self._frames.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is None or cached[0] != version:
+                cached = (version, build())
+                self._frames[key] = cached
+        return cached[1]
+
+    def read_csv(self, path):
+        """Returns the typed frame for a CSV artifact, or an empty frame if the file does not exist."""
+        version = file_version(path)
+        if version is None:
+            return pd.DataFrame()
+        return self._cached(path, version, lambda: pd.read_csv(path, dtype={"Game": str}))
+
+    def derived(self, key, paths, build):
+        """Returns build() cached until any of the files in paths changes, appears or disappears."""
+        version = tuple((path, file_version(path)) for path in sorted(paths))
+        return self._cached(key, version, build)
+
+    def pair_index(self, path):
+        """Pair index (see build_pair_index) over a two-player CSV, rebuilt only when the file changes."""
+        return self.derived(("pair_index", path), [path], lambda: build_pair_index(self.read_csv(path)))
+
+    def game_catalog(self, path=CATALOG_PATH):
+        """The game catalog indexed by Game, reloaded when analytics.py rewrites it."""
+        return self.derived(("game_catalog", path), [path], lambda: load_catalog(path))
+
+    def lineup_index(self, path):
+        """LineupIndex over a season lineup CSV, rebuilt only when the file changes (None if it has no lineups)."""
+        def build():
+            lineups_df = self.read_csv(path)
+            if lineups_df.empty or not {"Lineup ID", "Plus/Minus"} <= set(lineups_df.columns):
+                return None
+            return LineupIndex(lineups_df)
+        return self.derived(("lineup_index", path), [path], build)
+
+    def save_snapshot(self, path=SNAPSHOT_PATH):
+        """Pickles every cached frame with the file versions it was read at."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            frames = dict(self._frames)
+        with open(path, "wb") as file:
+            pickle.dump(frames, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_snapshot(self, path=SNAPSHOT_PATH):
+        """
+        Seeds the cache from a snapshot and returns how many entries it held (0 if there is none).
+        Entries whose files changed after the snapshot was written are re-read on first use, as usual.
+        """
+        try:
+            with open(path, "rb") as file:
+                frames = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return 0
+        with self._lock:
+            self._frames.update(frames)
+        return len(frames)
+
+
+def write_snapshot(csv_paths, path=SNAPSHOT_PATH):
+    """Prebuilds the app's boot data: the CSVs in csv_paths and the game catalog, read exactly as the app reads them."""
+    layer = DataLayer()
+    for csv_path in csv_paths:
+        layer.read_csv(csv_path)
+    layer.game_catalog()
+    layer.save_snapshot(path)
+
+
+def render_png(fig, dpi=FIGURE_DPI):
+    """Renders a matplotlib figure to PNG bytes and closes it."""
+    from matplotlib import pyplot as plt  # only needed when a figure is actually drawn
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+class FigureCache:
+    """
+    Bounded LRU cache of rendered plots, shared by every session.
+    - Keyed on (plot, versions of the files it reads, parameters); values are PNG bytes
+    - A repeat view is a dictionary lookup and never touches matplotlib
+    - A new version of a plot replaces the old one; past max_entries the least recently used plot is evicted
+    """
+
+    def __init__(self, max_entries=FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()  # (plot, version, params) -> PNG bytes
+        self._lock = threading.Lock()
+
+    def png(self, plot, paths, draw, params=()):
+        """PNG bytes of the figure returned by draw(), drawn only when the plot, its files or params changed."""
+        version = tuple((path, file_version(path)) for path in sorted(paths))
+        key = (plot, version, params)
+        with self._lock:
+            png = self._figures.get(key)
+            if png is not None:
+                self._figures.move_to_end(key)
+                return png
+
+        png = render_png(draw())
+        with self._lock:
+            for stale in [cached for cached in self._figures if cached[0] == plot and cached[2] == params]:
+                del self._figures[stale]
+            self._figures[key] = png
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return png
+
+
+# Shared by every session of the app
+data = DataLayer()
+figures = FigureCache()
@@ -0,0 +1,150 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from analytics import process_game
+from instrument import Instrumentation
+from roster import RosterRegistry
+from Season_Merge import (boxscore_totals, combination_totals_table, four_factors_averages, lineup_four_factors_totals,
+                          lineup_outcomes, lineup_totals, player_totals)
+from season import COMBINATION_TABLES, empty_state, fold, game_contribution
+from synthetic_games import write_games
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Stages in pipeline order: the per-game stages of analytics.process_game, then the season fold
+STAGES = ["parse", "name matching", "lineup reconstruction", "stints", "lineup merge", "four factors", "write",
+          "season aggregation"]
+
+
+def benchmark_season(games, output_folder, registry, instrumentation):
+    """Folds every game into an empty season state and derives the season totals, as Season_Merge.py does."""
+    with instrumentation.stage("season aggregation", rows_in=len(games)) as stage:
+        state = empty_state(None)
+        for game in games:
+            fold(state, game_contribution(game, output_folder, registry))
+        tables = state["tables"]
+        season_outputs = [
+            player_totals(tables["players"], registry.players),
+            lineup_totals(tables["lineups"], registry.players),
+            lineup_outcomes(tables["lineups"], registry.players),
+            lineup_four_factors_totals(tables["lineups"], registry.players),
+            *(combination_totals_table(tables[table], registry.players, size)
+              for size, table in COMBINATION_TABLES.items()),
+            boxscore_totals(tables["boxscore"]),
+            four_factors_averages(tables["four_factors"]),
+        ]
+        stage["rows_out"] = sum(len(df) for df in season_outputs)
+
+
+def peak_rss_bytes():
+    """Peak resident memory of this process (ru_maxrss is in kilobytes on Linux), or None where unsupported."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_benchmark(game_paths, trace_memory=False):
+    """
+    Times every stage over game_paths in a scratch folder (its Output/ is discarded afterwards).
+    Returns a report: per-stage seconds, games/s, rows/s and tracemalloc peak, plus the process peak RSS.
+    """
+    game_paths = [os.path.abspath(path) for path in game_paths]
+    workspace = tempfile.mkdtemp(prefix="elms_benchmark_")
+    previous_folder = os.getcwd()
+    instrumentation = Instrumentation(trace_memory=trace_memory)
+    try:
+        os.chdir(workspace)
+        output_folder = os.path.join("Output", "Games")
+        os.makedirs(output_folder)
+        registry = RosterRegistry()
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for path in game_paths:
+                process_game(path, output_folder, registry, instrumentation)
+            games = [os.path.splitext(os.path.basename(path))[0] for path in game_paths]
+            benchmark_season(games, output_folder, registry, instrumentation)
+        total_seconds = time.perf_counter() - start
+    finally:
+        os.chdir(previous_folder)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    stages = {name: {"seconds": 0.0, "cpu_seconds": 0.0, "calls": 0, "rows": 0, "peak_bytes": None}
+              for name in STAGES}
+    for record in instrumentation.records:
+        stage = stages[record["stage"]]
+        stage["seconds"] += record["wall_seconds"]
+        stage["cpu_seconds"] += record["cpu_seconds"]
+        stage["calls"] += 1
+        stage["rows"] += (record["rows_in"] if record["rows_in"] is not None else record["rows_out"]) or 0
+        if record["peak_bytes"] is not None:
+            stage["peak_bytes"] = max(stage["peak_bytes"] or 0, record["peak_bytes"])
+
+    return {
+        "games": len(game_paths),
+        "seconds": round(total_seconds, 4),
+        "games_per_second": round(len(game_paths) / total_seconds, 2) if total_seconds else None,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "stages": {
+            name: {
+                **stage,
+                "seconds": round(stage["seconds"], 4),
+                "cpu_seconds": round(stage["cpu_seconds"], 4),
+                "games_per_second": round(len(game_paths) / stage["seconds"], 2) if stage["seconds"] else None,
+                "rows_per_second": round(stage["rows"] / stage["seconds"]) if stage["seconds"] else None,
+            }
+            for name, stage in stages.items()
+        },
+    }
+
+
+def print_report(report):
+    print(f"{'Stage':<24}{'Seconds':>10}{'Share':>8}{'Games/s':>12}{'Rows/s':>14}{'Peak MB':>10}")
+    for name, stage in report["stages"].items():
+        share = stage["seconds"] / report["seconds"] * 100 if report["seconds"] else 0
+        peak = f"{stage['peak_bytes'] / 2 ** 20:.1f}" if stage["peak_bytes"] is not None else "-"
+        print(f"{name:<24}{stage['seconds']:>10.3f}{share:>7.1f}%{stage['games_per_second'] or 0:>12.1f}"
+              f"{stage['rows_per_second'] or 0:>14,}{peak:>10}")
+    rss = f", peak RSS {report['peak_rss_bytes'] / 2 ** 20:.0f} MB" if report["peak_rss_bytes"] else ""
+    print(f"✅ Benchmarked {report['games']} games in {report['seconds']:.2f}s "
+          f"({report['games_per_second']} games/s{rss})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Time each stage of the game pipeline and the season aggregation.")
+    parser.add_argument("--games", help="Folder of XML files to benchmark (default: generate synthetic games)")
+    parser.add_argument("--count", type=int, default=200, help="Number of synthetic games to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic games")
+    parser.add_argument("--trace-memory", action="store_true", help="Record tracemalloc peaks (slows every stage)")
+    parser.add_argument("--json", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    synthetic_folder = None
+    if args.games:
+        paths = [os.path.join(args.games, filename) for filename in sorted(os.listdir(args.games))
+                 if filename.lower().endswith(".xml")]
+    else:
+        synthetic_folder = tempfile.mkdtemp(prefix="elms_synthetic_")
+        paths = write_games(args.count, synthetic_folder, args.seed)
+        print(f"✅ Generated {args.count} synthetic games")
+
+    try:
+        report = run_benchmark(paths, args.trace_memory)
+    finally:
+        if synthetic_folder:
+            shutil.rmtree(synthetic_folder, ignore_errors=True)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,75 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from roster import is_elms
+from store import season_label
+
+# One row per game file, built at ingest from <venue>, <status> and <linescore>
+CATALOG_PATH = "Output/game_catalog.csv"
+CATALOG_COLUMNS = ["Game", "Game ID", "Date", "Season", "Opponent", "Home/Away", "Elms Score", "Opponent Score",
+                   "Result", "Complete", "Status", "Duplicate Of"]
+
+# Per-game CSV artifacts; the catalog has one column per artifact holding its path
+CATALOG_ARTIFACTS = ["plus_minus", "lineup_pm", "lineup_instances", "result_metrics", "merged_lineups",
+                     "two_player_combinations", "boxscore", "four_factors_summary", "stints", "lineup_four_factors",
+                     "game_ratings"]
+
+
+def catalog_entry(venue, artifact_paths):
+    """Catalog fields of one parsed game (venue from parse_game, artifact name -> CSV path)."""
+    teams = venue.get("teams", {})
+    elms = "H" if is_elms(teams.get("H", {}).get("name", venue.get("homename", ""))) else "V"
+    opponent = "V" if elms == "H" else "H"
+
+    try:
+        date = datetime.strptime(venue.get("date", ""), "%m/%d/%Y").date().isoformat()
+    except ValueError:
+        date = ""
+
+    elms_score = int(teams.get(elms, {}).get("score") or 0)
+    opponent_score = int(teams.get(opponent, {}).get("score") or 0)
+    if venue.get("neutralgame") == "Y":
+        home_away = "Neutral"
+    else:
+        home_away = "Home" if elms == "H" else "Away"
+
+    return {
+        "Game ID": venue.get("gameid", ""),
+        "Date": date,
+        "Season": season_label(venue),
+        "Opponent": teams.get(opponent, {}).get("name", ""),
+        "Home/Away": home_away,
+        "Elms Score": elms_score,
+        "Opponent Score": opponent_score,
+        "Result": "W" if elms_score > opponent_score else "L" if elms_score < opponent_score else "T",
+        "Complete": venue.get("status", {}).get("complete") == "Y",
+        **artifact_paths,
+    }
+
+
+def write_catalog(games, path=CATALOG_PATH):
+    """Writes the catalog from the manifest's game entries, sorted by date then game."""
+    rows = []
+    for name, entry in games.items():
+        row = {"Game": name, "Status": entry.get("status"), "Duplicate Of": entry.get("duplicate_of")}
+        row.update(entry.get("catalog") or {})
+        rows.append(row)
+    catalog_df = pd.DataFrame(rows).reindex(columns=CATALOG_COLUMNS + CATALOG_ARTIFACTS)
+    catalog_df = catalog_df.sort_values(["Date", "Game"], na_position="last")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    catalog_df.to_csv(path, index=False)
+
+
+def load_catalog(path=CATALOG_PATH):
+    """Reads the catalog indexed by Game, so a game's row is a hash lookup (catalog.loc[game])."""
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=CATALOG_COLUMNS + CATALOG_ARTIFACTS).set_index("Game", drop=False)
+    return pd.read_csv(path, dtype={"Game": str, "Game ID": str, "Date": str}).set_index("Game", drop=False)
+
+
+def season_games(catalog):
+    """Names of the successfully built, non-duplicate games, in date order."""
+    built = catalog[(catalog["Status"] == "ok") & catalog["Duplicate Of"].isna()]
+    return built["Game"].tolist()
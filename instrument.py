@@ -0,0 +1,66 @@
+import contextlib
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+
+def run_id():
+    """Identifies one pipeline run in a report (UTC start time)."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class Instrumentation:
+    """
+    Opt-in per-stage measurements for one unit of work (a game, or a whole run).
+    - Each stage records wall time, CPU time, rows in/out and the tracemalloc peak above its starting memory
+    - Records carry the context given to the constructor (game, run, ...) so reports can be aggregated
+    - When disabled, stages only run their body and nothing is recorded
+    """
+
+    def __init__(self, enabled=True, trace_memory=True, **context):
+        self.enabled = enabled
+        self.context = context
+        self.records = []
+        if enabled and trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name, rows_in=None):
+        """Measures the body of a with block; set stage["rows_out"] inside it."""
+        record = {"stage": name, "rows_in": rows_in, "rows_out": None}
+        if not self.enabled:
+            yield record
+            return
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = round(time.perf_counter() - wall, 6)
+            record["cpu_seconds"] = round(time.process_time() - cpu, 6)
+            record["peak_bytes"] = tracemalloc.get_traced_memory()[1] - baseline if tracing else None
+            self.records.append({**self.context, **record})
+
+
+def write_report(path, records, **context):
+    """Appends stage records to a JSONL report, one JSON object per line, with the run context added."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as file:
+        for record in records:
+            file.write(json.dumps({**context, **record}) + "\n")
+
+
+def profile_call(path, function, *args):
+    """Runs function(*args) under cProfile and dumps the stats to path (read them with pstats)."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    profiler.dump_stats(path)
+    return result
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# Records what each game XML produced so unchanged games can be skipped on the next run
+MANIFEST_PATH = "Output/manifest.json"
+
+# Source files whose contents define the per-game outputs
+PIPELINE_SOURCES = ["analytics.py", "catalog.py", "roster.py", "store.py"]
+
+
+def file_sha256(file_path):
+    """Hashes a file's raw bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_version(sources=PIPELINE_SOURCES):
+    """Hashes the pipeline source files, so any code change invalidates every game."""
+    module_folder = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for source in sources:
+        with open(os.path.join(module_folder, source), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def roster_signature(registry, roster_df):
+    """Hashes how a game's Elms players resolve in the registry (checkname, playerId -> Player ID)."""
+    canonical_names = registry.resolve_roster(roster_df).dropna()
+    identities = sorted(
+        (roster_df.at[index, "checkname"], roster_df.at[index, "playerId"], registry.ids[name])
+        for index, name in canonical_names.items()
+    )
+    return hashlib.sha256(json.dumps(identities).encode()).hexdigest()[:16]
+
+
+def game_fingerprint(game):
+    """
+    Hashes the parsed content of a game (venue, plays and boxscore), ignoring how the XML was serialized.
+    Two files exported separately for the same game (e.g. Emmanuel.XML and EMMANUEL_WBB.XML) share a fingerprint.
+    """
+    digest = hashlib.sha256(json.dumps(game.venue, sort_keys=True).encode())
+    for df in (game.plays, game.boxscore):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if os.path.exists(path):
+        with open(path) as file:
+            return json.load(file)
+    return {"code_version": None, "roster_version": None, "games": {}}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+
+def is_up_to_date(entry, sha256, version):
+    """True if a manifest entry was built from the same bytes by the same code and all its artifacts exist."""
+    return (
+        entry is not None
+        and entry.get("status") == "ok"
+        and entry.get("sha256") == sha256
+        and entry.get("code_version") == version
+        and all(os.path.exists(artifact) for artifact in entry.get("artifacts", []))
+    )
+
+
+def mark_duplicates(games):
+    """
+    Flags games whose fingerprint matches another game's.
+    The first game by name is kept as the original; the rest get "duplicate_of".
+    """
+    originals = {}
+    for name in sorted(games):
+        entry = games[name]
+        fingerprint = entry.get("fingerprint")
+        entry["duplicate_of"] = originals.get(fingerprint) if fingerprint else None
+        if fingerprint and fingerprint not in originals:
+            originals[fingerprint] = name
+
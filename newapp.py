@@ -1,30 +1,78 @@
+import time
+started = time.perf_counter()
 import pandas as pd
 import os
+import base64
+from functools import wraps
 from shiny import App, ui, render, reactive, req
-from thefuzz import fuzz
-from matplotlib import pyplot as plt
-import numpy as np
-from scipy.stats import pearsonr
+from roster import RosterRegistry, resolve_typed_name
+from app_data import data, figures, file_version
+from catalog import CATALOG_ARTIFACTS, CATALOG_PATH
+# matplotlib and scipy are imported by the plots that use them, the first time one is drawn
+imported = time.perf_counter()
 
 
 # Paths
-games_folder = "Output/Games"
 season_folder = "Output/Season"
 
 
-# Game labels and player list
-game_labels = sorted([
-  "ALBERTUS_WBB", "AMHERST_WBB", "ANNA_MARIA_WBB", "COLBY_SAWYER_WBB", "Dean", "Emerson", "Emmanuel",
-  "EMMANUEL_WBB", "Fitchburg State", "Gordon", "JWU_PROVIDENCE_WBB", "JWU_PROVIDENCE_WBB2",
-  "LASELL_WBB", "LASELL_WBB2", "MITCHELL_WBB", "NAZARETH", "NEC_WBB", "REGIS_BB",
-  "RIVIER", "Salem State", "ST_JOSEPH_S(ME)_WBB", "USJ CT", "VSU Lyndon", "WBB NORWICH AT ELMS 2024-25",
-  "Wellesley", "Wentworth", "Westfield", "WPI"
-])
+# Season data: seeded from the snapshot Season_Merge.py prebuilds, so boot reads one file instead of every CSV
+snapshot_entries = data.load_snapshot()
 
 
-player_names = ["SMITH,HEAVEN", "GUERRIER,PHONIA", "PACHECO,MIA", "TURCO,MARY", "WASIEWICZ,GABBY",
-                            "LEWIS,JADE","URIBE,TALIA","GORSKI,JENNY","BARRON,SHEA","LEBEL,KELLY","ASFAW,SOLIYANA",
-                            "JOHNSTON,RAHMIA","GRAHAM,PIPER","ANDRADE,SOPHIA","MILDNER,STEPHANIE"]
+# Game labels (from the game catalog written by analytics.py, in date order) and player list
+def catalog_labels(catalog):
+  where = catalog["Home/Away"].map({"Home": "vs", "Away": "at", "Neutral": "vs"}).fillna("vs")
+  labels = (catalog["Date"].fillna("") + " " + where + " " + catalog["Opponent"].fillna("") + " ("
+            + catalog["Result"].fillna("") + " " + catalog["Elms Score"].astype("Int64").astype(str) + "-"
+            + catalog["Opponent Score"].astype("Int64").astype(str) + ")")
+  # Games whose build failed have no score
+  labels = labels.where(catalog["Elms Score"].notna(), catalog["Game"] + " (not built)")
+  return dict(zip(catalog["Game"], labels))
+
+
+player_names = RosterRegistry().players
+loaded = time.perf_counter()
+print(f"✅ App startup: imports {imported - started:.2f}s, data load {loaded - imported:.2f}s "
+      f"({snapshot_entries} frames from the snapshot).")
+
+
+# Durations and clock readings are stored as integer seconds; they are only formatted as MM:SS for display
+DISPLAY_TIMES = {"Total Seconds": "Total Time", "Start Clock": "Start Time", "End Clock": "End Time"}
+
+
+def display_times(df):
+  """Shows an artifact's integer-second columns as MM:SS (minutes keep counting past 99)."""
+  columns = [column for column in DISPLAY_TIMES if column in df.columns]
+  if not columns:
+    return df
+  df = df.copy()
+  for column in columns:
+    seconds = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+    formatted = (seconds // 60).astype(str).str.zfill(2) + ":" + (seconds % 60).astype(str).str.zfill(2)
+    df[column] = formatted.where(seconds.notna(), "")
+  return df.rename(columns=DISPLAY_TIMES)
+
+
+def season_csv_paths():
+  # The season folder itself (files added or removed) and the first season CSV, which several plots read
+  files = [f for f in os.listdir(season_folder) if f.endswith(".csv")] if os.path.exists(season_folder) else []
+  return [season_folder] + [os.path.join(season_folder, f) for f in files[:1]]
+
+
+def cached_figure(plot, paths):
+  """
+  Serves a plot function's figure as an <img> from the shared figure cache (use with @render.ui).
+  The function only runs, and matplotlib only renders, when a file from paths() has changed since the last view.
+  """
+  def decorate(draw):
+    @wraps(draw)
+    def serve():
+      png = figures.png(plot, paths(), draw)
+      return ui.img(src="data:image/png;base64," + base64.b64encode(png).decode("ascii"),
+                    style="max-width: 100%; height: auto;")
+    return serve
+  return decorate
 
 
 # UI
@@ -43,7 +91,7 @@ app_ui = ui.page_navbar(
       ui.row(
           ui.column(4, ""),
           ui.column(4,
-              ui.input_select("selected_game", "Choose a Game", choices=game_labels),
+              ui.input_select("selected_game", "Choose a Game", choices={}),
               ui.input_select("second_dropdown", "Select a File", choices={})
           ),
           ui.column(4, "")
@@ -70,8 +118,7 @@ app_ui = ui.page_navbar(
           ui.column(6,
               ui.input_slider("pm_range", "Filter Plus/Minus (from -9 to 9):", min=-9, max=9, value=[-9, 9]),
               ui.input_checkbox_group("pm_extremes", "Include:", choices=["Lower than -9", "Higher than 9"]),
-              ui.input_text("player_filter", "Search for a Lineup", placeholder="e.g. GORSKI,TURCO"),
-              ui.input_action_button("go_button", "Go", class_="btn-primary")
+              ui.input_text("player_filter", "Search for a Lineup", placeholder="e.g. GORSKI,TURCO")
           ),
           ui.column(3, "")
       ),
@@ -102,25 +149,25 @@ app_ui = ui.page_navbar(
  ui.nav_panel("Final Project Part 2 Graphs",
 ui.h2("Final Project Graphs", class_="text-center"),
     ui.h4("Minutes vs Points Correlation", class_="text-center"),
-    ui.output_plot("corr_minutes_points"),
+    ui.output_ui("corr_minutes_points"),
 
     ui.hr(),
     ui.h4("Top 5 Most Productive Lineups", class_="text-center"),
-    ui.output_plot("best_lineup_graph"),
+    ui.output_ui("best_lineup_graph"),
 
     ui.hr(),
     ui.h4("Distribution of Plus/Minus Values", class_="text-center"),
-    ui.output_plot("plus_minus_dist"),
+    ui.output_ui("plus_minus_dist"),
 
     ui.hr(),
     ui.h4("simpler graphs", class_="text-center"),
-    ui.output_plot("final_graph"),
-    ui.output_plot("player_scoring_graph"),
+    ui.output_ui("final_graph"),
+    ui.output_ui("player_scoring_graph"),
 #new q 3 
     ui.hr(),
     ui.h4("Lineups With Most Positive / Negative Games", class_="text-center"),
     ui.output_table("lineup_pm_freq_table"),
-    ui.output_plot("lineup_pm_freq_plot"),
+    ui.output_ui("lineup_pm_freq_plot"),
 
 )
 )
@@ -134,14 +181,30 @@ ui.h2("Final Project Graphs", class_="text-center"),
 def server(input, output, session):
 
 
+  @reactive.poll(lambda: file_version(CATALOG_PATH), 5)
+  def game_catalog():
+      # Re-read whenever analytics.py rewrites the catalog, so games built after boot show up
+      return data.game_catalog()
+
+
+  @reactive.Effect
+  def update_game_dropdown():
+      labels = catalog_labels(game_catalog())
+      with reactive.isolate():
+          selected = input.selected_game()
+      ui.update_select("selected_game", choices=labels, selected=selected if selected in labels else None)
+
+
   @reactive.Calc
   def matching_files():
+      # Artifact CSVs of the selected game, straight from its catalog row: {path: label}
+      catalog = game_catalog()
       selected = input.selected_game()
-      all_files = os.listdir(games_folder)
-      csv_files = [f for f in all_files if f.endswith(".csv")]
-      matched = [f for f in csv_files if fuzz.partial_ratio(selected.lower(), f.lower()) > 70]
-      display_map = {f.replace("_", " ").replace(".csv", "").title(): f for f in matched}
-      return display_map
+      if selected not in catalog.index:
+          return {}
+      row = catalog.loc[selected]
+      return {row[artifact]: artifact.replace("_", " ").title()
+              for artifact in CATALOG_ARTIFACTS if isinstance(row[artifact], str)}
 
 
   @reactive.Effect
@@ -151,12 +214,9 @@ def server(input, output, session):
 
   @reactive.Calc
   def load_game_data():
-      selected_file = input.second_dropdown()
-      if selected_file:
-          file_map = matching_files()
-          actual_file = file_map.get(selected_file, selected_file)
-          file_path = os.path.join(games_folder, actual_file)
-          df = pd.read_csv(file_path)
+      file_path = input.second_dropdown()
+      if file_path and file_path in matching_files():
+          df = data.read_csv(file_path)
           if "Game" in df.columns:
               df = df.drop(columns=["Game"])
           return df
@@ -187,95 +247,69 @@ def server(input, output, session):
           file_map = season_file_choices()
           actual_file = file_map.get(selected, selected)
           file_path = os.path.join(season_folder, actual_file)
-          return pd.read_csv(file_path)
+          return data.read_csv(file_path)
       return pd.DataFrame()
 
 
   @reactive.Calc
-  def lineup_df():
-      file_path = os.path.join(season_folder, "season_lineup_pm_totals.csv")
-      if os.path.exists(file_path):
-          return pd.read_csv(file_path)
-      return pd.DataFrame()
-
-
-  @reactive.event(input.go_button)
   def filtered_lineups():
-      df = lineup_df()
-      if df.empty or "Plus/Minus" not in df.columns:
+      index = data.lineup_index(os.path.join(season_folder, "season_lineup_pm_totals.csv"))
+      if index is None:
           return pd.DataFrame({"Message": ["No data or Plus/Minus column missing"]})
 
 
       pm_min, pm_max = input.pm_range()
       extremes = input.pm_extremes()
       player_input = input.player_filter().strip()
-      player_parts = [p.strip().upper() for p in player_input.split(",") if p.strip()]
+      player_parts = [p.strip() for p in player_input.split(",") if p.strip()]
 
 
       if len(player_parts) > 5:
           return pd.DataFrame({"Message": ["Please enter up to 5 player names only"]})
 
 
-      within_range = df[(df["Plus/Minus"] >= pm_min) & (df["Plus/Minus"] <= pm_max)]
-      lower_extreme = df[df["Plus/Minus"] < -9] if "Lower than -9" in extremes else pd.DataFrame()
-      upper_extreme = df[df["Plus/Minus"] > 9] if "Higher than 9" in extremes else pd.DataFrame()
-
+      player_ids = [resolve_typed_name(p, tuple(player_names)) for p in player_parts]
+      if None in player_ids:
+          return pd.DataFrame({"Message": ["No matching lineups found"]})
 
-      combined = pd.concat([upper_extreme, within_range, lower_extreme ], ignore_index=True).drop_duplicates()
 
-
-      if player_parts:
-          def contains_all(lineup):
-              return all(any(part in player for player in lineup.split(",")) for part in player_parts)
-          combined = combined[combined["Lineup"].apply(contains_all)]
+      ranges = [(pm_min, pm_max)]
+      if "Lower than -9" in extremes:
+          ranges.append((float("-inf"), -10))
+      if "Higher than 9" in extremes:
+          ranges.append((10, float("inf")))
+      combined = index.query(ranges, player_ids)
 
 
       return combined if not combined.empty else pd.DataFrame({"Message": ["No matching lineups found"]})
 
 
-  @reactive.Calc
-  def two_player_df():
-      file_path = os.path.join(season_folder, "season_two_player_totals.csv")
-      if os.path.exists(file_path):
-          return pd.read_csv(file_path)
-      return pd.DataFrame()
+  def typed_pair(text_input):
+      # Resolves "GORSKI, TURCO" to a (lower, higher) Player ID key, or None
+      players = [p.strip() for p in text_input.split(",") if p.strip()]
+      if len(players) != 2:
+          return None
+      player_ids = [resolve_typed_name(p, tuple(player_names)) for p in players]
+      if None in player_ids or player_ids[0] == player_ids[1]:
+          return ()
+      return tuple(sorted(player_ids))
 
 
   @reactive.event(input.two_player_go)
   def filtered_two_player_data():
-      df = two_player_df()
-      if df.empty or "Player 1" not in df.columns or "Player 2" not in df.columns:
+      file_path = os.path.join(season_folder, "season_two_player_totals.csv")
+      index = data.pair_index(file_path)
+      if not index:
           return pd.DataFrame({"Message": ["No data or required columns missing"]})
 
 
-      text_input = input.two_player_input().strip()
-      players = [p.strip().upper() for p in text_input.split(",") if p.strip()]
-
-
-      if len(players) != 2:
+      key = typed_pair(input.two_player_input())
+      if key is None:
           return pd.DataFrame()
 
 
-      p1_input, p2_input = players
-
-
-      def fuzzy_match(p_input, name):
-          return fuzz.partial_ratio(p_input, name.upper()) >= 80
-
-
-      def row_matches(row):
-          p1_row = row["Player 1"]
-          p2_row = row["Player 2"]
-          return (
-              (fuzzy_match(p1_input, p1_row) and fuzzy_match(p2_input, p2_row)) or
-              (fuzzy_match(p1_input, p2_row) and fuzzy_match(p2_input, p1_row))
-          )
-
-
-      result = df[df.apply(row_matches, axis=1)].reset_index(drop=True)
-
-
-      return result if not result.empty else pd.DataFrame({"Message": ["No matching combination found"]})
+      result = index.get(key)
+      return result if result is not None else pd.DataFrame({"Message": ["No matching combination found"]})
 
 
   @reactive.event(input.combo_go)
@@ -285,52 +319,31 @@ def server(input, output, session):
           return pd.DataFrame({"Message": ["Game-by-game combo file not found"]})
 
 
-      df = pd.read_csv(file_path)
-      if df.empty or "Player 1" not in df.columns or "Player 2" not in df.columns:
+      index = data.pair_index(file_path)
+      if not index:
           return pd.DataFrame({"Message": ["Required columns missing"]})
 
 
-      text_input = input.combo_input().strip()
-      players = [p.strip().upper() for p in text_input.split(",") if p.strip()]
-
-
-      if len(players) != 2:
+      key = typed_pair(input.combo_input())
+      if key is None:
           return pd.DataFrame({"Message": ["Please enter exactly 2 player names."]})
 
 
-      p1_input, p2_input = players
-
-
-      def fuzzy_match(p_input, name):
-          return fuzz.partial_ratio(p_input, name.upper()) >= 80
-
-
-      def row_matches(row):
-          p1_row = row["Player 1"]
-          p2_row = row["Player 2"]
-          return (
-              (fuzzy_match(p1_input, p1_row) and fuzzy_match(p2_input, p2_row)) or
-              (fuzzy_match(p1_input, p2_row) and fuzzy_match(p2_input, p1_row))
-          )
-
-
-      result = df[df.apply(row_matches, axis=1)].reset_index(drop=True)
-
-
-      return result if not result.empty else pd.DataFrame({"Message": ["No matching combinations found"]})
+      result = index.get(key)
+      return result if result is not None else pd.DataFrame({"Message": ["No matching combinations found"]})
 
 
   @output
   @render.table
   def game_table():
-      return load_game_data()
+      return display_times(load_game_data())
 
 #changes i just made
   @output
   @render.data_frame
   def season_table():
       df = load_season_data()
-      return render.DataTable(df)
+      return render.DataTable(display_times(df))
 
 
   @output
@@ -343,25 +356,30 @@ def server(input, output, session):
   @output
   @render.table
   def lineup_filtered_table():
-      return filtered_lineups()
+      return display_times(filtered_lineups())
 
 
   @output
   @render.table
   def two_player_table():
-      return filtered_two_player_data()
+      return display_times(filtered_two_player_data())
 
 
   @output
   @render.table
   def combo_table():
-      return combo_data()
+      return display_times(combo_data())
   
 
  #graphs I ADDED NEW BUT NOT DONE
   @output
-  @render.plot
+  @render.ui
+  @cached_figure("corr_minutes_points", season_csv_paths)
   def corr_minutes_points():
+    from matplotlib import pyplot as plt
+    import numpy as np
+    from scipy.stats import pearsonr
+
     files = [f for f in os.listdir(season_folder) if f.endswith(".csv")]
     if not files:
         fig, ax = plt.subplots()
@@ -369,7 +387,7 @@ def server(input, output, session):
         ax.axis("off")
         return fig
 
-    df = pd.read_csv(os.path.join(season_folder, files[0]))
+    df = data.read_csv(os.path.join(season_folder, files[0])).copy()
 
     fig, ax = plt.subplots(figsize=(6, 5))
     if "MIN" in df.columns and "PTS" in df.columns:
@@ -410,8 +428,10 @@ def server(input, output, session):
   
 
   @output
-  @render.plot
+  @render.ui
+  @cached_figure("final_graph", season_csv_paths)
   def final_graph():
+      from matplotlib import pyplot as plt
 
       if not os.path.exists(season_folder):
           fig, ax = plt.subplots()
@@ -428,7 +448,7 @@ def server(input, output, session):
 
       #
       file_path = os.path.join(season_folder, files[0])
-      df = pd.read_csv(file_path)
+      df = data.read_csv(file_path)
 
       fig, axes = plt.subplots(1, 3, figsize=(15, 4))
 
@@ -464,8 +484,11 @@ def server(input, output, session):
       plt.tight_layout()
       return fig
   @output
-  @render.plot
+  @render.ui
+  @cached_figure("player_scoring_graph", season_csv_paths)
   def player_scoring_graph():
+      from matplotlib import pyplot as plt
+
       # Look for any season CSV file
       files = [f for f in os.listdir(season_folder) if f.endswith(".csv")]
       if not files:
@@ -475,7 +498,7 @@ def server(input, output, session):
           return fig
 
       file_path = os.path.join(season_folder, files[0])
-      df = pd.read_csv(file_path)
+      df = data.read_csv(file_path).copy()
 
       fig, ax = plt.subplots(figsize=(8, 5))
 
@@ -491,11 +514,8 @@ def server(input, output, session):
               # Keep rows where the team name looks like Elms
               df = df[df[team_col].str.contains("Elms", case=False, na=False)]
           else:
-              # fallback: use your known player list
-              elms_players = ["SMITH,HEAVEN", "GUERRIER,PHONIA", "PACHECO,MIA", "TURCO,MARY", "WASIEWICZ,GABBY",
-                            "LEWIS,JADE","URIBE,TALIA","GORSKI,JENNY","BARRON,SHEA","LEBEL,KELLY","ASFAW,SOLIYANA",
-                            "JOHNSTON,RAHMIA","GRAHAM,PIPER","ANDRADE,SOPHIA","MILDNER,STEPHANIE"]
-              df = df[df["Player"].str.upper().isin(elms_players)]
+              # fallback: use the roster registry's player list
+              df = df[df["Player"].str.upper().isin(player_names)]
 
           if df.empty:
               ax.text(0.5, 0.5, "No Elms players found in this file", ha="center", va="center")
@@ -521,8 +541,11 @@ def server(input, output, session):
   #this is a new graph
 
   @output
-  @render.plot
+  @render.ui
+  @cached_figure("best_lineup_graph", lambda: [os.path.join(season_folder, "season_lineup_pm_totals.csv")])
   def best_lineup_graph():
+      from matplotlib import pyplot as plt
+
       file_path = os.path.join(season_folder, "season_lineup_pm_totals.csv")
       if not os.path.exists(file_path):
           fig, ax = plt.subplots()
@@ -530,7 +553,7 @@ def server(input, output, session):
           ax.axis("off")
           return fig
 
-      df = pd.read_csv(file_path)
+      df = data.read_csv(file_path)
       fig, ax = plt.subplots(figsize=(10, 6))
       if "Lineup" in df.columns and "Plus/Minus" in df.columns:
           top5 = df.nlargest(5, "Plus/Minus")
@@ -546,8 +569,11 @@ def server(input, output, session):
       return fig
 
   @output
-  @render.plot
+  @render.ui
+  @cached_figure("plus_minus_dist", lambda: [os.path.join(season_folder, "season_lineup_pm_totals.csv")])
   def plus_minus_dist():
+      from matplotlib import pyplot as plt
+
       file_path = os.path.join(season_folder, "season_lineup_pm_totals.csv")
       if not os.path.exists(file_path):
           fig, ax = plt.subplots()
@@ -555,7 +581,7 @@ def server(input, output, session):
           ax.axis("off")
           return fig
 
-      df = pd.read_csv(file_path)
+      df = data.read_csv(file_path)
       fig, ax = plt.subplots(figsize=(6, 5))
       if "Plus/Minus" in df.columns:
           ax.hist(df["Plus/Minus"].dropna(), bins=15, color="pink", edgecolor="black")
@@ -568,68 +594,49 @@ def server(input, output, session):
       plt.tight_layout()
       return fig
   #new q 3 graphs 
-  def load_all_game_lineups():
-    all_rows = []
-    for f in os.listdir(games_folder):
-        if f.endswith(".csv"):
-            df = pd.read_csv(os.path.join(games_folder, f))
-            if "Lineup" in df.columns and "Plus/Minus" in df.columns:
-                
-                df["Lineup"] = df["Lineup"].apply(
-                    lambda x: tuple(sorted(eval(x))) if isinstance(x, str) else x
-                )
-
-                all_rows.append(df[["Lineup", "Plus/Minus"]])
-    return pd.concat(all_rows, ignore_index=True) if all_rows else pd.DataFrame()
+  def lineup_outcome_leaders():
+    # Lineups with the most positive and most negative games, from the season outcome index
+    file_path = os.path.join(season_folder, "season_lineup_outcomes.csv")
+
+    def build():
+      freq = data.read_csv(file_path)
+      if freq.empty:
+        return pd.DataFrame()
+      freq = freq.rename(columns={"Positive Games": "positive_games", "Negative Games": "negative_games",
+                                  "Appearances": "total_appearances"})
+      freq = freq[["Lineup", "positive_games", "negative_games", "total_appearances"]]
+      return pd.concat([
+          freq.nlargest(1, "positive_games").assign(Category="Most Games With Positive Plus/Minus"),
+          freq.nlargest(1, "negative_games").assign(Category="Most Games With Negative Plus/Minus")
+      ])
+
+    return data.derived("lineup_outcome_leaders", [file_path], build) if os.path.exists(file_path) else pd.DataFrame()
 
   @output
   @render.table
   def lineup_pm_freq_table():
-    df = load_all_game_lineups()
-
-    if df.empty:
-        return pd.DataFrame({"Message": ["No lineup data found in game files"]})
-
-    freq = df.groupby("Lineup").agg(
-        positive_games=("Plus/Minus", lambda x: (x > 0).sum()),
-        negative_games=("Plus/Minus", lambda x: (x < 0).sum()),
-        total_appearances=("Plus/Minus", "count")
-    ).reset_index()
+    result = lineup_outcome_leaders()
 
-    best_positive = freq.nlargest(1, "positive_games")
-    worst_negative = freq.nlargest(1, "negative_games")
-
-    result = pd.concat([
-        best_positive.assign(Category="Most Games With Positive Plus/Minus"),
-        worst_negative.assign(Category="Most Games With Negative Plus/Minus")
-    ])
+    if result.empty:
+        return pd.DataFrame({"Message": ["No lineup data found in the season outcome index"]})
 
     return result
   
 
   @output
-  @render.plot
+  @render.ui
+  @cached_figure("lineup_pm_freq_plot", lambda: [os.path.join(season_folder, "season_lineup_outcomes.csv")])
   def lineup_pm_freq_plot():
-    df = load_all_game_lineups()
+    from matplotlib import pyplot as plt
+
+    plot_df = lineup_outcome_leaders()
 
-    if df.empty:
+    if plot_df.empty:
         fig, ax = plt.subplots()
         ax.text(0.5, 0.5, "No lineup data found", ha="center", va="center")
         ax.axis("off")
         return fig
-    freq = df.groupby("Lineup").agg(
-        positive_games=("Plus/Minus", lambda x: (x > 0).sum()),
-        negative_games=("Plus/Minus", lambda x: (x < 0).sum()),
-        total_appearances=("Plus/Minus", "count")
-    ).reset_index()
-    # Select best + worst
-    best_pos = freq.nlargest(1, "positive_games")
-    worst_neg = freq.nlargest(1, "negative_games")
-
-    plot_df = pd.concat([
-        best_pos.assign(Type="Most Games Positive"),
-        worst_neg.assign(Type="Most Games Negative")
-    ])
+    plot_df = plot_df.assign(Type=["Most Games Positive", "Most Games Negative"])
     fig, ax = plt.subplots(figsize=(8, 4))
     ax.bar(plot_df["Type"], plot_df["positive_games"], color="green", label="Positive Games")
     ax.bar(plot_df["Type"], plot_df["negative_games"], color="red", label="Negative Games", bottom=plot_df["positive_games"])
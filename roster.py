@@ -0,0 +1,226 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Persistent alias table: one row per (playerId, checkname) seen in a game file
+ALIAS_TABLE_PATH = "Output/roster_aliases.csv"
+ALIAS_COLUMNS = ["Player ID", "Player", "playerId", "checkname"]
+
+# Official Elms roster, used to seed the alias table the first time it is created
+ELMS_ROSTER = ["SMITH,HEAVEN", "GUERRIER,PHONIA", "PACHECO,MIA", "TURCO,MARY", "WASIEWICZ,GABBY",
+               "LEWIS,JADE", "URIBE,TALIA", "GORSKI,JENNY", "BARRON,SHEA", "LEBEL,KELLY", "ASFAW,SOLIYANA",
+               "JOHNSTON,RAHMIA", "GRAHAM,PIPER", "ANDRADE,SOPHIA", "MILDNER,STEPHANIE"]
+
+MATCH_THRESHOLD = 80
+
+# Lineups are int64 bitmasks over Player IDs, so the registry holds at most 63 players
+MAX_PLAYERS = 63
+
+# Persisted lineups: "Lineup ID" is the bitmask; "Lineup" is a display label of names joined with this
+LINEUP_SIZE = 5
+LINEUP_SEPARATOR = " / "
+
+
+def is_elms(team_name):
+    """True if a team name refers to Elms."""
+    return "elm" in str(team_name).lower()
+
+
+def lineup_mask(player_ids):
+    """Encodes an iterable of Player IDs as a lineup bitmask."""
+    mask = 0
+    for player_id in player_ids:
+        mask |= 1 << int(player_id)
+    return mask
+
+
+def lineup_player_ids(mask):
+    """Decodes a lineup bitmask into its Player IDs, in ascending order."""
+    mask = int(mask)
+    return [player_id for player_id in range(mask.bit_length()) if mask >> player_id & 1]
+
+
+def lineup_members(masks, size=LINEUP_SIZE):
+    """Vectorized decode of bitmasks that all have `size` players into an (n, size) array of Player IDs, ascending."""
+    masks = np.asarray(masks, dtype=np.int64)
+    bits = (masks[:, None] >> np.arange(MAX_PLAYERS, dtype=np.int64)) & 1
+    return np.nonzero(bits)[1].reshape(len(masks), size)
+
+
+def name_order(members, players):
+    """Reorders each row of an (n, size) Player ID array into name order."""
+    names = np.asarray(players, dtype=object)
+    rank = np.empty(len(names), dtype=np.int64)
+    rank[np.argsort(names, kind="stable")] = np.arange(len(names))
+    return np.take_along_axis(members, np.argsort(rank[members], axis=1), axis=1)
+
+
+def lineup_names(mask, players):
+    """Decodes a lineup bitmask into a sorted tuple of canonical player names."""
+    return tuple(sorted(players[player_id] for player_id in lineup_player_ids(mask)))
+
+
+def lineup_label(mask, players):
+    """Display label for a lineup: its sorted canonical names joined with LINEUP_SEPARATOR."""
+    return LINEUP_SEPARATOR.join(lineup_names(mask, players))
+
+
+def lineup_table(masks, players):
+    """
+    Lineup dimension table: one row per lineup bitmask ("Lineup ID") with its players' IDs and names
+    in name order (Player 1 ID..Player 5 ID, Player 1..Player 5) and the display label.
+    """
+    rows = []
+    for mask in sorted(set(int(mask) for mask in masks)):
+        members = sorted(lineup_player_ids(mask), key=lambda player_id: players[player_id])
+        members += [None] * (LINEUP_SIZE - len(members))
+        rows.append([mask, *members, *(players[player] if player is not None else None for player in members),
+                     lineup_label(mask, players)])
+    columns = (["Lineup ID"] + [f"Player {slot} ID" for slot in range(1, LINEUP_SIZE + 1)]
+               + [f"Player {slot}" for slot in range(1, LINEUP_SIZE + 1)] + ["Lineup"])
+    lineup_df = pd.DataFrame(rows, columns=columns)
+    id_columns = [f"Player {slot} ID" for slot in range(1, LINEUP_SIZE + 1)]
+    lineup_df[id_columns] = lineup_df[id_columns].astype("Int64")
+    return lineup_df
+
+
+def popcount(masks):
+    """Vectorized count of players in each lineup bitmask."""
+    x = np.asarray(masks).astype(np.uint64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int8)
+
+
+@lru_cache(maxsize=4096)
+def closest_roster_name(name, roster):
+    """Fuzzy-matches a name against a roster tuple, memoized. Returns None below the threshold."""
+    from thefuzz import process  # only loaded once a name actually needs fuzzy matching
+
+    closest_match = process.extractOne(name.upper(), roster, scorer=process.fuzz.token_sort_ratio)
+    if closest_match and closest_match[1] >= MATCH_THRESHOLD:
+        return closest_match[0]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def resolve_typed_name(text, roster):
+    """
+    Resolves a name typed in the app ("GORSKI", "jen", "Jenny Gorski") to an index into a roster tuple.
+    Tries an exact match, then a prefix of the full, last or first name, then fuzzy matching. None if nothing fits.
+    """
+    text = text.strip().upper()
+    if not text:
+        return None
+    if text in roster:
+        return roster.index(text)
+    for index, name in enumerate(roster):
+        last_name, _, first_name = name.partition(",")
+        if name.startswith(text) or last_name.startswith(text) or first_name.strip().startswith(text):
+            return index
+    from thefuzz import process
+
+    closest_match = process.extractOne(text, roster, scorer=process.fuzz.WRatio)
+    if closest_match and closest_match[1] >= MATCH_THRESHOLD:
+        return roster.index(closest_match[0])
+    return None
+
+
+class RosterRegistry:
+    """
+    Resolves Elms players to a canonical name and a stable integer Player ID.
+    - Identity is keyed by the XML (playerId, checkname) pair and stored in ALIAS_TABLE_PATH
+    - A playerId or checkname seen before resolves with a dictionary lookup
+    - Fuzzy matching only runs for names the registry has never seen
+    - Unmatched Elms players are added to the roster with the next free Player ID
+    """
+
+    def __init__(self, path=ALIAS_TABLE_PATH):
+        self.path = path
+        self.players = []  # canonical names, list index = Player ID
+        self.ids = {}  # canonical name -> Player ID
+        self.aliases = {}  # (playerId, checkname) -> Player ID
+        self.by_player_id = {}  # playerId -> Player ID
+        self.by_name = {}  # checkname -> Player ID
+        self.changed = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            for name in ELMS_ROSTER:
+                self._add_alias(self._add_player(name), "", name)
+            return
+
+        alias_df = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+        alias_df["Player ID"] = alias_df["Player ID"].astype(int)
+        roster = alias_df.drop_duplicates("Player ID").sort_values("Player ID")
+        self.players = roster["Player"].tolist()
+        self.ids = {name: player for player, name in enumerate(self.players)}
+        for row in alias_df.itertuples(index=False):
+            self._add_alias(row[0], row[2], row[3])
+        self.changed = False
+
+    def save(self):
+        """Writes the alias table if anything new was resolved."""
+        if not self.changed:
+            return
+        rows = [(player, self.players[player], player_id, checkname)
+                for (player_id, checkname), player in self.aliases.items()]
+        alias_df = pd.DataFrame(rows, columns=ALIAS_COLUMNS).sort_values(["Player ID", "playerId", "checkname"])
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        alias_df.to_csv(self.path, index=False)
+        self.changed = False
+
+    def _add_player(self, name):
+        if len(self.players) >= MAX_PLAYERS:
+            raise ValueError(f"Roster registry is full ({MAX_PLAYERS} players); cannot add {name}")
+        self.players.append(name)
+        self.ids[name] = len(self.players) - 1
+        self.changed = True
+        return len(self.players) - 1
+
+    def _add_alias(self, player, player_id, checkname):
+        self.aliases[(player_id, checkname)] = player
+        if player_id:
+            self.by_player_id[player_id] = player
+        self.by_name.setdefault(checkname, player)
+        self.changed = True
+
+    def resolve(self, player_id, checkname):
+        """Returns the Player ID for an Elms <player> element, registering it if it is new."""
+        player_id = player_id or ""
+        key = (player_id, checkname)
+        if key in self.aliases:
+            return self.aliases[key]
+
+        player = self.by_player_id.get(player_id) if player_id else None
+        if player is None:
+            player = self.by_name.get(checkname)
+        if player is None:
+            match = closest_roster_name(checkname, tuple(self.players))
+            player = self.ids[match] if match else self._add_player(checkname)
+
+        self._add_alias(player, player_id, checkname)
+        return player
+
+    def resolve_roster(self, roster_df):
+        """
+        Resolves the Elms rows of a game roster (from parse_game).
+        Returns a Series of canonical names aligned with roster_df (None for other teams and TEAM rows).
+        """
+        canonical_names = pd.Series(None, index=roster_df.index, dtype=object)
+        elms_rows = roster_df["Team"].map(is_elms) & (roster_df["checkname"].str.upper() != "TEAM")
+        for index, row in roster_df[elms_rows].iterrows():
+            canonical_names[index] = self.players[self.resolve(row["playerId"], row["checkname"])]
+        return canonical_names
+
+    def match(self, name):
+        """Looks up a canonical name without registering anything; fuzzy fallback is memoized."""
+        name = str(name).strip()
+        player = self.by_name.get(name.upper())
+        if player is not None:
+            return self.players[player]
+        return closest_roster_name(name, tuple(self.players))
@@ -0,0 +1,159 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from analytics import COMBINATION_SIZES, STINT_EVENT_COLUMNS, combination_totals
+from roster import lineup_player_ids
+from store import read_game
+
+# Running season totals, plus the contribution each game made to them
+SEASON_STATE_PATH = "Output/Season/season_state.pkl"
+CONTRIBUTIONS_FOLDER = "Output/Season/contributions"
+
+# Source files whose contents define the season state; changing them rebuilds it from scratch
+STATE_SOURCES = ["season.py", "roster.py", "analytics.py"]
+
+# Additive sufficient statistics kept for every player, pair and lineup: stint totals, plus games played
+STINT_TOTALS = ["seconds", "points_for", "points_against", "possessions_for", "possessions_against"]
+ON_COURT_STATS = STINT_TOTALS + ["games"]
+BOXSCORE_COUNTS = ["MIN", "FGM", "FGA", "3PM", "3PA", "FTM", "FTA", "OREB", "DREB", "REB",
+                   "AST", "STL", "BLK", "TO", "PF", "PTS"]
+FOUR_FACTORS = ["OREB%", "TOV%", "EFG%", "FTR"]
+
+# Per-lineup game outcome counts (games the lineup finished ahead, behind or even)
+OUTCOME_STATS = ["positive_games", "negative_games", "zero_games"]
+
+# Combination size -> table of every pair, trio and quartet of players, keyed by their bitmask
+COMBINATION_TABLES = dict(zip(COMBINATION_SIZES, ["pairs", "trios", "quartets"]))
+
+# Table name -> (index columns, value columns)
+STATE_TABLES = {
+    "players": (["player_id"], ON_COURT_STATS),
+    **{table: (["combination"], ON_COURT_STATS) for table in COMBINATION_TABLES.values()},
+    "lineups": (["lineup"], ON_COURT_STATS + OUTCOME_STATS + STINT_EVENT_COLUMNS),
+    "boxscore": (["Player", "Team"], BOXSCORE_COUNTS + ["games"]),
+    "four_factors": (["Player"], [f"{factor} {stat}" for factor in FOUR_FACTORS for stat in ("sum", "count")]
+                     + ["games"]),
+}
+
+
+def _table(rows, table):
+    """Builds a state table from rows of (index..., values...)."""
+    index_columns, value_columns = STATE_TABLES[table]
+    return pd.DataFrame(rows, columns=index_columns + value_columns).set_index(index_columns)
+
+
+def empty_state(version):
+    return {
+        "code_version": version,
+        "games": {},  # game -> stamp it was folded with
+        "tables": {table: _table([], table) for table in STATE_TABLES},
+    }
+
+
+def load_state(version, path=SEASON_STATE_PATH):
+    """Loads the season state, or an empty one if it is missing or was built by other code."""
+    if os.path.exists(path):
+        with open(path, "rb") as file:
+            state = pickle.load(file)
+        if state.get("code_version") == version:
+            return state
+    return empty_state(version)
+
+
+def save_state(state, path=SEASON_STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        pickle.dump(state, file)
+
+
+def game_contribution(game, output_folder, registry):
+    """
+    Reads one game's artifacts and reduces them to the additive statistics it adds to the season.
+    Players are credited for every stint; lineups and their pairs, trios and quartets only for 5-player stints.
+    Lineups also add up the play event counts their Four Factors are derived from.
+    """
+    stints = read_game("stints", game, ["lineup", "players", *STINT_TOTALS, *STINT_EVENT_COLUMNS], output_folder)
+    lineups = stints["lineup"].to_numpy(dtype=np.int64)
+    on_court = stints[STINT_TOTALS].to_numpy(dtype=np.int64)
+
+    player_rows = []
+    for player_id in lineup_player_ids(np.bitwise_or.reduce(lineups, initial=0)):
+        on_floor = (lineups >> player_id) & 1 == 1
+        player_rows.append((player_id, *on_court[on_floor].sum(axis=0), 1))
+
+    five_totals = stints[stints["players"] == 5].groupby("lineup")[[*STINT_TOTALS, *STINT_EVENT_COLUMNS]].sum()
+    five = five_totals[STINT_TOTALS]
+    lineup_rows = [(lineup, *totals, 1,
+                    int(points_for > points_against), int(points_for < points_against), int(points_for == points_against),
+                    *events)
+                   for lineup, totals, points_for, points_against, events
+                   in zip(five.index, five.to_numpy(), five["points_for"], five["points_against"],
+                          five_totals[STINT_EVENT_COLUMNS].to_numpy())]
+
+    combination_tables = {}
+    for size, table in COMBINATION_TABLES.items():
+        combination_tables[table] = combination_totals(stints, size)[STINT_TOTALS]
+        combination_tables[table]["games"] = 1
+
+    boxscore_df = read_game("boxscore", game, ["Player", "Team"] + BOXSCORE_COUNTS, output_folder)
+    boxscore_df[BOXSCORE_COUNTS] = boxscore_df[BOXSCORE_COUNTS].apply(pd.to_numeric, errors="coerce").fillna(0).astype("int64")
+    boxscore = boxscore_df.groupby(["Player", "Team"])[BOXSCORE_COUNTS].sum()
+    boxscore["games"] = 1
+
+    # Per-game files use canonical names; older files fall back to a memoized fuzzy match
+    four_factors_df = read_game("four_factors_summary", game, ["Player"] + FOUR_FACTORS, output_folder)
+    matched_names = {name: registry.match(name) for name in four_factors_df["Player"].unique()}
+    four_factors_df["Player"] = four_factors_df["Player"].map(matched_names)
+    four_factors = four_factors_df.dropna(subset=["Player"]).groupby("Player")[FOUR_FACTORS].agg(["sum", "count"])
+    four_factors.columns = [f"{factor} {stat}" for factor, stat in four_factors.columns]
+    four_factors["games"] = 1
+
+    return {
+        "players": _table(player_rows, "players"),
+        **combination_tables,
+        "lineups": _table(lineup_rows, "lineups"),
+        "boxscore": boxscore,
+        "four_factors": four_factors,
+    }
+
+
+def fold(state, contribution, sign=1):
+    """
+    Adds (sign=1) or subtracts (sign=-1) one game's contribution from the season totals.
+    Only the rows of the game's keys are touched: keys the table lacks are added as zero rows,
+    the game's values are added in place, and rows no game contributes to anymore are dropped.
+    Rows stay sorted by key, so the totals do not depend on the order games were folded in.
+    """
+    for table, frame in contribution.items():
+        totals = state["tables"][table]
+        if totals.empty:
+            totals = frame.iloc[:0]  # typed like the contribution
+        new_keys = frame.index.difference(totals.index)
+        if len(new_keys):
+            totals = totals.reindex(totals.index.append(new_keys), fill_value=0).sort_index()
+        rows = totals.index.get_indexer(frame.index)
+        for position, column in enumerate(totals.columns):
+            totals.iloc[rows, position] += sign * frame[column].to_numpy()
+        emptied = frame.index[totals["games"].to_numpy()[rows] <= 0]
+        state["tables"][table] = totals.drop(emptied) if len(emptied) else totals
+
+
+def contribution_path(game, folder=CONTRIBUTIONS_FOLDER):
+    return os.path.join(folder, f"{game}.pkl")
+
+
+def save_contribution(game, contribution, folder=CONTRIBUTIONS_FOLDER):
+    os.makedirs(folder, exist_ok=True)
+    pd.to_pickle(contribution, contribution_path(game, folder))
+
+
+def load_contribution(game, folder=CONTRIBUTIONS_FOLDER):
+    return pd.read_pickle(contribution_path(game, folder))
+
+
+def remove_contribution(game, folder=CONTRIBUTIONS_FOLDER):
+    if os.path.exists(contribution_path(game, folder)):
+        os.remove(contribution_path(game, folder))
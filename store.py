@@ -0,0 +1,86 @@
+import glob
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+
+# pyarrow is optional: without it the pipeline only writes CSVs
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# One Parquet dataset per artifact type: Output/Store/<artifact>/season=<season>/game=<game>/part-0.parquet
+STORE_FOLDER = "Output/Store"
+
+# Text columns that look numeric but are identifiers (jersey "00" must stay "00")
+TEXT_COLUMNS = {"No.", "Player", "Team", "Game", "Lineup", "Player 1", "Player 2"}
+
+
+def store_available():
+    return pa is not None
+
+
+def season_label(venue):
+    """Season a game belongs to, from the venue date ("1/11/2025" -> "2024-25"). Seasons start in July."""
+    try:
+        date = datetime.strptime(venue.get("date", ""), "%m/%d/%Y")
+    except ValueError:
+        return "unknown"
+    start_year = date.year if date.month >= 7 else date.year - 1
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+def typed(df):
+    """
+    Gives an artifact proper column types for the store: numeric text becomes numbers.
+    """
+    df = df.drop(columns="Game", errors="ignore").copy()
+    for column in df.columns:
+        values = df[column]
+        if values.dtype != object and not pd.api.types.is_string_dtype(values):
+            continue
+        if column not in TEXT_COLUMNS:
+            numbers = pd.to_numeric(values, errors="coerce")
+            if numbers.notna().sum() == values.notna().sum():
+                # float64 even for whole numbers, so a column has one type across every game partition
+                df[column] = numbers.astype("float64")
+    return df
+
+
+def game_partitions(artifact, game, folder=STORE_FOLDER):
+    return glob.glob(os.path.join(folder, artifact, "season=*", f"game={glob.escape(game)}"))
+
+
+def remove_game(game, folder=STORE_FOLDER):
+    """Deletes every partition of a game, in every artifact and season."""
+    for partition in glob.glob(os.path.join(folder, "*", "season=*", f"game={glob.escape(game)}")):
+        shutil.rmtree(partition)
+
+
+def write_game(outputs, season, game, folder=STORE_FOLDER):
+    """
+    Writes one game's artifacts (artifact name -> DataFrame) as Parquet partitions.
+    Returns the paths written, or an empty list when pyarrow is not installed.
+    """
+    if not store_available():
+        return []
+
+    remove_game(game, folder)
+    paths = []
+    for artifact, output_df in outputs.items():
+        partition = os.path.join(folder, artifact, f"season={season}", f"game={game}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, "part-0.parquet")
+        typed(output_df).to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def read_game(artifact, game, columns=None, csv_folder="Output/Games", folder=STORE_FOLDER):
+    """Reads one game's artifact from the store, or from its CSV when the store has no partition for it."""
+    partitions = game_partitions(artifact, game, folder) if store_available() else []
+    if partitions:
+        return pd.read_parquet(os.path.join(partitions[0], "part-0.parquet"), columns=columns, memory_map=True)
+    return pd.read_csv(os.path.join(csv_folder, f"{game}_{artifact}.csv"), usecols=columns)
@@ -0,0 +1,331 @@
+import hashlib
+import os
+import random
+import time
+from datetime import date, timedelta
+from xml.sax.saxutils import quoteattr
+
+from roster import ELMS_ROSTER
+
+# Opponents the synthetic schedule rotates through: (team id, name, location)
+OPPONENTS = [
+    ("AMC", "Albertus Magnus", "Cosgrove Marcus Messer Cr"), ("AMA", "Anna Maria", "Paxton, Mass."),
+    ("CSC", "Colby-Sawyer", "New London, NH"), ("DEN", "Dean College", "Franklin, Mass."),
+    ("EMC", "Emerson", "Boston, Mass. (Bobbi Brown and Steven Plofker Gym)"),
+    ("EMM", "Emmanuel (MA)", "Jean Yawkey Center, Boston, MA"), ("FSU", "Fitchburg St.", "Fitchburg, MA"),
+    ("GOR", "Gordon", "Wenham, MA"), ("JWU", "JWU (Providence)", "Providence, RI"), ("LAS", "Lasell", "Newton, MA"),
+    ("MIT", "Mitchell", "New London, CT"), ("NAZ", "Nazareth", "Rochester, NY"), ("NEC", "New England Col.", "Henniker, NH"),
+    ("NOR", "Norwich", "Northfield, VT"), ("REG", "Regis (MA)", "Weston, MA"), ("RIV", "Rivier", "Nashua, NH"),
+    ("SJC", "Saint Joseph (CT)", "West Hartford, CT"), ("SJM", "St. Joseph's (ME)", "Standish, ME"),
+    ("SSU", "Salem St.", "Salem, MA"), ("VTL", "VTSU Lyndon", "Lyndonville, VT"), ("WEL", "Wellesley", "Wellesley, MA"),
+    ("WEN", "Wentworth", "Boston, MA"), ("WSU", "Westfield St.", "Westfield, MA"), ("WPI", "WPI", "Worcester, MA"),
+]
+FIRST_NAMES = ["AVA", "EMMA", "OLIVIA", "MIA", "SOPHIA", "ISABELLA", "GRACE", "CHLOE", "LILY", "ELLA", "MADISON",
+               "ABIGAIL", "HANNAH", "KAYLA", "JORDAN", "TAYLOR", "MORGAN", "SYDNEY", "RILEY", "PAIGE"]
+LAST_NAMES = ["JOHNSON", "WILLIAMS", "BROWN", "JONES", "GARCIA", "MILLER", "DAVIS", "RODRIGUEZ", "MARTINEZ", "WILSON",
+              "ANDERSON", "THOMAS", "MOORE", "JACKSON", "MARTIN", "LEE", "WHITE", "HARRIS", "CLARK", "LEWIS"]
+
+ROSTER_SIZE = 12
+GAMES_PER_SEASON = 28
+RULES = {"prds": 4, "minutes": 10, "minutesot": 5}
+
+# <stats>/<statsbyprd> counters, in the order PrestoSports writes them
+STAT_NAMES = ["fgm", "fga", "fgm3", "fga3", "ftm", "fta", "tp", "blk", "stl", "ast", "min", "oreb", "dreb", "treb",
+              "pf", "tf", "to", "dq"]
+
+
+def attributes(**values):
+    return " ".join(f"{key.rstrip('_')}={quoteattr(str(value))}" for key, value in values.items())
+
+
+def player_id(team_id, checkname):
+    """Stable 16-character playerId, like the ones the live stats tool assigns."""
+    return hashlib.sha1(f"{team_id}:{checkname}".encode()).hexdigest()[:16]
+
+
+def display_name(checkname):
+    last_name, _, first_name = checkname.partition(",")
+    return f"{last_name.title()}, {first_name.title()}"
+
+
+def opponent_roster(opponent_index):
+    """The same twelve players every time a given opponent is played."""
+    rng = random.Random(opponent_index)
+    names = set()
+    while len(names) < ROSTER_SIZE:
+        names.add(f"{rng.choice(LAST_NAMES)},{rng.choice(FIRST_NAMES)}")
+    return sorted(names)
+
+
+class Team:
+    """One side of a simulated game: roster, players on the floor and their counting stats by period."""
+
+    def __init__(self, vh, team_id, name, checknames, rng):
+        self.vh = vh
+        self.id = team_id
+        self.name = name
+        self.players = [{"checkname": checkname, "uni": str(number), "playerId": player_id(team_id, checkname)}
+                        for number, checkname in zip(rng.sample(range(0, 45), len(checknames)), checknames)]
+        self.on_floor = list(range(5))
+        self.stats = {}  # (player index, period) -> {stat: count}
+        self.points = 0
+        self.period_points = {}
+
+    def add(self, player, period, **counts):
+        stats = self.stats.setdefault((player, period), dict.fromkeys(STAT_NAMES, 0))
+        for stat, count in counts.items():
+            stats[stat] += count
+
+    def totals(self, player=None, period=None):
+        totals = dict.fromkeys(STAT_NAMES, 0)
+        for (stats_player, stats_period), stats in self.stats.items():
+            if (player is None or stats_player == player) and (period is None or stats_period == period):
+                for stat in STAT_NAMES:
+                    totals[stat] += stats[stat]
+        totals["treb"] = totals["oreb"] + totals["dreb"]
+        totals["tp"] = 2 * (totals["fgm"] - totals["fgm3"]) + 3 * totals["fgm3"] + totals["ftm"]
+        return totals
+
+
+class GameSimulation:
+    """
+    Plays out a game possession by possession and records it the way the live stats tool does:
+    plays (shots, free throws, rebounds, turnovers, steals, blocks, assists, fouls, substitutions)
+    with running scores, and per-player counting stats by period.
+    """
+
+    def __init__(self, rng, elms, opponent):
+        self.rng = rng
+        self.teams = {"V": elms, "H": opponent} if elms.vh == "V" else {"V": opponent, "H": elms}
+        self.periods = []  # (number, length, plays)
+        self.plays = None
+        self.period = 0
+        self.clock = 0
+
+    def play(self, team, player, action, type_=None, score=False):
+        values = {"vh": team.vh, "time": f"{self.clock // 60:02d}:{self.clock % 60:02d}",
+                  "uni": team.players[player]["uni"], "team": team.id, "checkname": team.players[player]["checkname"],
+                  "action": action}
+        if type_:
+            values["type_"] = type_
+        if score:
+            values["vscore"] = self.teams["V"].points
+            values["hscore"] = self.teams["H"].points
+        values["side"] = "left" if team.vh == "V" else "right"
+        self.plays.append(values)
+
+    def credit_minutes(self, seconds):
+        for team in self.teams.values():
+            for player in team.on_floor:
+                team.add(player, self.period, min=seconds)
+
+    def substitute(self, team):
+        bench = [player for player in range(len(team.players)) if player not in team.on_floor]
+        for _ in range(self.rng.choice((1, 1, 2))):
+            leaving = self.rng.choice(team.on_floor)
+            entering = self.rng.choice(bench)
+            bench.remove(entering)
+            bench.append(leaving)
+            team.on_floor[team.on_floor.index(leaving)] = entering
+            self.play(team, leaving, "SUB", "OUT")
+            self.play(team, entering, "SUB", "IN")
+
+    def score(self, team, shooter, points):
+        team.points += points
+        team.period_points[self.period] = team.period_points.get(self.period, 0) + points
+
+    def possession(self, offense, defense):
+        """Plays out one possession; returns True if it ended in a dead ball (a chance to substitute)."""
+        rng = self.rng
+        shooter = rng.choice(offense.on_floor)
+        outcome = rng.random()
+        if outcome < 0.14:
+            offense.add(shooter, self.period, to=1)
+            self.play(offense, shooter, "TURNOVER")
+            if rng.random() < 0.5:
+                stealer = rng.choice(defense.on_floor)
+                defense.add(stealer, self.period, stl=1)
+                self.play(defense, stealer, "STEAL")
+                return False
+            return True
+
+        if outcome < 0.24:
+            fouler = rng.choice(defense.on_floor)
+            defense.add(fouler, self.period, pf=1)
+            self.play(defense, fouler, "FOUL")
+            for attempt in range(2):
+                offense.add(shooter, self.period, fta=1)
+                if rng.random() < 0.72:
+                    offense.add(shooter, self.period, ftm=1)
+                    self.score(offense, shooter, 1)
+                    self.play(offense, shooter, "GOOD", "FT", score=True)
+                else:
+                    self.play(offense, shooter, "MISS", "FT")
+                    if attempt == 1:
+                        return self.rebound(offense, defense)
+            return True
+
+        three = rng.random() < 0.35
+        shot_type = "3PTR" if three else rng.choice(("LAYUP", "JUMPER", "LAYUP", "TIPIN"))
+        offense.add(shooter, self.period, fga=1, fga3=int(three))
+        if rng.random() < (0.30 if three else 0.45):
+            offense.add(shooter, self.period, fgm=1, fgm3=int(three))
+            self.score(offense, shooter, 3 if three else 2)
+            self.play(offense, shooter, "GOOD", shot_type, score=True)
+            if rng.random() < 0.6:
+                assister = rng.choice([player for player in offense.on_floor if player != shooter])
+                offense.add(assister, self.period, ast=1)
+                self.play(offense, assister, "ASSIST")
+            return rng.random() < 0.3
+        self.play(offense, shooter, "MISS", shot_type)
+        if rng.random() < 0.08:
+            blocker = rng.choice(defense.on_floor)
+            defense.add(blocker, self.period, blk=1)
+            self.play(defense, blocker, "BLOCK")
+        return self.rebound(offense, defense)
+
+    def rebound(self, offense, defense):
+        if self.rng.random() < 0.28:
+            rebounder = self.rng.choice(offense.on_floor)
+            offense.add(rebounder, self.period, oreb=1)
+            self.play(offense, rebounder, "REBOUND", "OFF")
+            self.clock = max(self.clock - self.rng.randint(2, 8), 0)
+            return self.possession(offense, defense)
+        rebounder = self.rng.choice(defense.on_floor)
+        defense.add(rebounder, self.period, dreb=1)
+        self.play(defense, rebounder, "REBOUND", "DEF")
+        return False
+
+    def run(self):
+        offense, defense = self.teams["V"], self.teams["H"]
+        while True:
+            self.period += 1
+            regulation = self.period <= RULES["prds"]
+            if not regulation and self.teams["V"].points != self.teams["H"].points:
+                break
+            length = (RULES["minutes"] if regulation else RULES["minutesot"]) * 60
+            self.clock = length
+            self.plays = []
+            if self.period > 1:
+                for team in self.teams.values():
+                    if self.rng.random() < 0.5:
+                        self.substitute(team)
+            while self.clock > 0:
+                elapsed = min(self.rng.randint(6, 24), self.clock)
+                self.credit_minutes(elapsed)
+                self.clock -= elapsed
+                dead_ball = self.possession(offense, defense)
+                if dead_ball and self.clock > 0:
+                    for team in self.teams.values():
+                        if self.rng.random() < 0.25:
+                            self.substitute(team)
+                offense, defense = defense, offense
+            self.periods.append((self.period, length, self.plays))
+
+
+def percentage(made, attempted):
+    return round(100 * made / attempted, 1) if attempted else 0
+
+
+def stats_element(tag, stats, **extra):
+    """A <stats> (with shooting percentages) or <statsbyprd> element; minutes are counted in seconds until here."""
+    stats = dict(stats, min=round(stats["min"] / 60))
+    if tag == "stats":
+        stats.update(fgpct=percentage(stats["fgm"], stats["fga"]), fg3pct=percentage(stats["fgm3"], stats["fga3"]),
+                     ftpct=percentage(stats["ftm"], stats["fta"]))
+    return f"<{tag} {attributes(**extra, **stats)}></{tag}>"
+
+
+def team_xml(team, periods):
+    numbers = [number for number, _, _ in periods]
+    line = ",".join(str(team.period_points.get(number, 0)) for number in numbers)
+    lines = [f'  <team {attributes(vh=team.vh, code=team.id, id=team.id, name=team.name)}>',
+             f'    <linescore {attributes(line=line, score=team.points)}>']
+    lines += [f'      <lineprd {attributes(prd=number, score=team.period_points.get(number, 0))}></lineprd>'
+              for number in numbers]
+    lines += ["    </linescore>", "    <totals>"]
+    lines.append("      " + stats_element("stats", team.totals()))
+    lines += ["      " + stats_element("statsbyprd", team.totals(period=number), prd=number) for number in numbers]
+    lines.append("    </totals>")
+
+    starters = set(range(5))
+    for index, player in enumerate(team.players):
+        totals = team.totals(player=index)
+        played = totals["min"] > 0
+        lines.append(f'    <player {attributes(uni=player["uni"], code=player["uni"], name=display_name(player["checkname"]), checkname=player["checkname"], class_="SO", gp=int(played), gs=int(index in starters), oncourt="Y" if index in team.on_floor else "N", playerId=player["playerId"])}>')
+        lines.append("      " + stats_element("stats", totals))
+        lines += ["      " + stats_element("statsbyprd", team.totals(player=index, period=number), prd=number)
+                  for number in numbers]
+        lines.append("    </player>")
+    lines.append("  </team>")
+    return lines
+
+
+def game_xml(simulation, game_id, game_date, location):
+    visitor, home = simulation.teams["V"], simulation.teams["H"]
+    periods = simulation.periods
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', "",
+             f'<bbgame {attributes(source="Basketball LiveStats In-Arena Tool", toolVersion="2.2.0", version="1.1.1", generated=game_date.strftime("%b %d, %Y"))}>',
+             f'  <venue {attributes(gameid=game_id, visid=visitor.id, visname=visitor.name, homeid=home.id, homename=home.name, date=game_date.strftime("%m/%d/%Y"), location=location, start="7:00 PM", attend=simulation.rng.randint(50, 400), leaguegame="Y", neutralgame="N", nitegame="N", postseason="N")}>',
+             f'    <rules {attributes(prds=RULES["prds"], minutes=RULES["minutes"], minutesot=RULES["minutesot"], fouls=5, qh="Q")}></rules>',
+             "  </venue>",
+             f'  <status {attributes(complete="Y", period=periods[-1][0], clock="00:00", running="F")}></status>']
+    lines += team_xml(visitor, periods)
+    lines += team_xml(home, periods)
+    lines.append('  <plays format="tokens">')
+    for number, length, plays in periods:
+        lines.append(f'    <period {attributes(number=number, time=f"{length // 60:02d}:00")}>')
+        for team in (visitor, home):
+            summary = team.totals(period=number)
+            del summary["min"], summary["tp"], summary["dq"]
+            lines.append(f'      <summary {attributes(vh=team.vh, **summary)}></summary>')
+        lines += [f"      <play {attributes(**play)}></play>" for play in plays]
+        lines += ['      <clock time="00:00"></clock>', "    </period>"]
+    lines += ["  </plays>", "</bbgame>", ""]
+    return "\n".join(lines)
+
+
+def generate_game(number, seed=0):
+    """Simulates synthetic game `number` of a schedule and returns its PrestoSports XML."""
+    rng = random.Random(seed * 1_000_003 + number)
+    opponent_index = number % len(OPPONENTS)
+    opponent_id, opponent_name, location = OPPONENTS[opponent_index]
+    elms_vh = rng.choice(("V", "H"))
+    opponent_vh = "H" if elms_vh == "V" else "V"
+
+    elms_players = rng.sample(ELMS_ROSTER, ROSTER_SIZE)
+    elms = Team(elms_vh, "ELM", "Elms", elms_players, rng)
+    opponent = Team(opponent_vh, opponent_id, opponent_name, opponent_roster(opponent_index), rng)
+
+    simulation = GameSimulation(rng, elms, opponent)
+    simulation.run()
+
+    season_start = date(2024 + number // GAMES_PER_SEASON, 11, 1)
+    game_date = season_start + timedelta(days=4 * (number % GAMES_PER_SEASON))
+    return game_xml(simulation, 9_000_000 + number, game_date, location if opponent_vh == "H" else "Elms College")
+
+
+def write_games(count, folder, seed=0):
+    """Writes `count` synthetic games to folder as SYN_<number>.XML and returns their paths."""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for number in range(count):
+        path = os.path.join(folder, f"SYN_{number:05d}.XML")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(generate_game(number, seed))
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate synthetic PrestoSports <bbgame> XML files.")
+    parser.add_argument("--count", type=int, default=100, help="Number of games to generate")
+    parser.add_argument("--output", default="Synthetic/Games/", help="Folder to write XML files to")
+    parser.add_argument("--seed", type=int, default=0, help="Seed; the same seed always produces the same games")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_games(args.count, args.output, args.seed)
+    print(f"✅ Generated {args.count} synthetic games in {args.output} in {time.perf_counter() - start:.2f}s")
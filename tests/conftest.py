@@ -0,0 +1,38 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+# The pipeline modules are top-level scripts in the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analytics import process_game  # noqa: E402
+from roster import RosterRegistry  # noqa: E402
+from season import game_contribution  # noqa: E402
+
+SEASON_GAMES = ["ALBERTUS_WBB", "AMHERST_WBB", "Dean", "Wellesley"]
+
+
+@pytest.fixture(scope="session")
+def season_games(tmp_path_factory):
+    """
+    Four games of the Games folder run through process_game in a scratch folder.
+    Returns the game names, their per-game season contributions and the registry that named the players.
+    """
+    workspace = tmp_path_factory.mktemp("season")
+    previous_folder = os.getcwd()
+    os.chdir(workspace)
+    try:
+        output_folder = os.path.join("Output", "Games")
+        os.makedirs(output_folder)
+        registry = RosterRegistry()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for game in SEASON_GAMES:
+                process_game(os.path.join(ROOT, "Games", f"{game}.XML"), output_folder, registry)
+        contributions = {game: game_contribution(game, output_folder, registry) for game in SEASON_GAMES}
+    finally:
+        os.chdir(previous_folder)
+    return SEASON_GAMES, contributions, registry
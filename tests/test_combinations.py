@@ -0,0 +1,60 @@
+from itertools import combinations
+
+import pandas as pd
+
+from analytics import calculate_plus_minus_combinations, combination_totals
+from roster import lineup_mask
+
+PLAYERS = ["SMITH,HEAVEN", "GUERRIER,PHONIA", "PACHECO,MIA", "TURCO,MARY", "WASIEWICZ,GABBY",
+           "LEWIS,JADE", "URIBE,TALIA"]
+
+# (Player IDs on the floor, seconds, points for, points against, possessions for, possessions against)
+STINTS = [
+    ([0, 1, 2, 3, 4], 120, 8, 4, 5, 4),
+    ([0, 1, 2, 3, 5], 90, 2, 7, 3, 4),
+    ([0, 1, 2, 3, 4], 60, 3, 3, 2, 2),  # the first lineup again
+    ([1, 2, 4, 5, 6], 200, 10, 6, 7, 8),
+    ([0, 1, 2, 3], 15, 2, 0, 1, 0),     # short-handed stints are left out of the combinations
+]
+
+
+def stints_df():
+    rows = [(lineup_mask(ids), len(ids), seconds, points_for, points_against, points_for - points_against,
+             possessions_for, possessions_against)
+            for ids, seconds, points_for, points_against, possessions_for, possessions_against in STINTS]
+    return pd.DataFrame(rows, columns=["lineup", "players", "seconds", "points_for", "points_against",
+                                       "plus_minus", "possessions_for", "possessions_against"])
+
+
+def previous_pair_plus_minus(stints):
+    """The pre-bitmask algorithm: lineup plus-minus summed into every sorted pair of names."""
+    lineup_pm = {}
+    for ids, _, points_for, points_against, _, _ in stints:
+        if len(ids) == 5:
+            lineup = tuple(PLAYERS[player] for player in ids)
+            lineup_pm[lineup] = lineup_pm.get(lineup, 0) + points_for - points_against
+    pairs = {}
+    for lineup, plus_minus in lineup_pm.items():
+        for combo in combinations(lineup, 2):
+            combo = tuple(sorted(combo))
+            pairs[combo] = pairs.get(combo, 0) + plus_minus
+    return pairs
+
+
+def test_pair_totals_match_the_previous_pair_plus_minus():
+    pairs_df = calculate_plus_minus_combinations(stints_df(), PLAYERS)
+    pairs = {(row["Player 1"], row["Player 2"]): row["Plus/Minus"] for _, row in pairs_df.iterrows()}
+
+    assert pairs == previous_pair_plus_minus(STINTS)
+
+
+def test_combination_totals_sum_every_subset_of_each_lineup():
+    for size in (3, 4):
+        totals = combination_totals(stints_df(), size)
+        for combo in combinations(range(len(PLAYERS)), size):
+            on_floor = [stint for stint in STINTS if len(stint[0]) == 5 and set(combo) <= set(stint[0])]
+            key = lineup_mask(combo)
+            if not on_floor:
+                assert key not in totals.index
+                continue
+            assert totals.loc[key].tolist() == [sum(stint[column] for stint in on_floor) for column in range(1, 6)]
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from analytics import possession_ratings, rate, segment_possessions
+
+# (vh, action, type, period, elapsed): Elms are the visitors
+PLAYS = [
+    ("V", "GOOD", "LAYUP", 1, 10),      # V 1: made basket
+    ("H", "MISS", "3PTR", 1, 20),
+    ("H", "REBOUND", "OFF", 1, 21),     # offensive rebound keeps the possession
+    ("H", "GOOD", "JUMPER", 1, 25),     # H 1
+    ("V", "GOOD", "LAYUP", 1, 30),
+    ("H", "FOUL", "", 1, 30),
+    ("V", "GOOD", "FT", 1, 30),         # V 2: the and-one ends on the free throw
+    ("H", "TURNOVER", "", 1, 40),       # H 2
+    ("V", "GOOD", "FT", 1, 50),
+    ("V", "MISS", "FT", 1, 50),
+    ("H", "REBOUND", "DEF", 1, 51),     # V 3: missed last free throw, defensive rebound
+    ("H", "MISS", "3PTR", 1, 590),
+    ("H", "REBOUND", "DEADB", 1, 590),  # dead-ball rebound to the shooting team keeps the possession
+    ("V", "SUB", "IN", 1, 600),         # H 3: ended by the end of the period
+    ("V", "SUB", "IN", 2, 600),
+    ("V", "GOOD", "3PTR", 2, 620),      # V 4
+]
+
+
+def plays_df():
+    return pd.DataFrame(PLAYS, columns=["vh", "action", "type", "period", "elapsed"]).astype(
+        {"vh": "category", "action": "category", "type": "category"})
+
+
+def test_known_sequence_splits_into_the_expected_possessions():
+    df = segment_possessions(plays_df())
+    ends = np.append(df["possession"].to_numpy()[1:] != df["possession"].to_numpy()[:-1], True)
+    offenses = df["offense"].to_numpy()[ends].tolist()
+
+    assert offenses == ["V", "H", "V", "H", "V", "H", "V"]
+    assert df["possession"].tolist() == [0, 1, 1, 1, 2, 2, 2, 3, 4, 4, 4, 5, 5, 5, 6, 6]
+
+
+def test_rate_is_per_100_and_empty_without_a_denominator():
+    ratio = rate(pd.Series([12, 5]), pd.Series([10, 0]))
+    assert ratio.iloc[0] == 120.0
+    assert np.isnan(ratio.iloc[1])
+
+
+def test_possession_ratings():
+    totals = pd.DataFrame({"points_for": [90, 0], "points_against": [80, 4],
+                           "possessions_for": [75, 0], "possessions_against": [80, 2]})
+    ratings = possession_ratings(totals)
+
+    assert ratings.loc[0].tolist() == [120.0, 100.0, 20.0]
+    assert np.isnan(ratings.loc[1, "Offensive Rating"])
+    assert ratings.loc[1, "Defensive Rating"] == 200.0
+    assert np.isnan(ratings.loc[1, "Net Rating"])
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from season import STATE_TABLES, empty_state, fold
+
+
+def folded(contributions):
+    state = empty_state(None)
+    for contribution in contributions:
+        fold(state, contribution)
+    return state
+
+
+def assert_same_tables(state, expected):
+    for table in STATE_TABLES:
+        pd.testing.assert_frame_equal(state["tables"][table].sort_index(), expected["tables"][table].sort_index(),
+                                      check_like=True, obj=table)
+
+
+def test_folding_a_game_in_and_back_out_leaves_an_empty_state(season_games):
+    games, contributions, _ = season_games
+    state = folded([contributions[games[0]]])
+    assert not state["tables"]["players"].empty
+
+    fold(state, contributions[games[0]], sign=-1)
+    for table in STATE_TABLES:
+        assert state["tables"][table].empty, table
+
+
+def test_removing_a_game_matches_a_fresh_fold_without_it(season_games):
+    games, contributions, _ = season_games
+    state = folded(contributions[game] for game in games)
+    fold(state, contributions[games[1]], sign=-1)
+
+    assert_same_tables(state, folded(contributions[game] for game in games if game != games[1]))
+
+
+def test_refolding_a_changed_game_matches_a_fresh_fold(season_games):
+    games, contributions, _ = season_games
+    state = folded(contributions[game] for game in games[:3])
+    # The "changed" game's old contribution (games[2]) is replaced by its new one (games[3])
+    fold(state, contributions[games[2]], sign=-1)
+    fold(state, contributions[games[3]])
+
+    assert_same_tables(state, folded(contributions[game] for game in [*games[:2], games[3]]))